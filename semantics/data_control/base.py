@@ -39,8 +39,8 @@ class BaseController(typing.Generic[DataInterfaceType]):
         """Release a previously acquired external reference to the element with the given index."""
         with self._data.registry_lock:
             assert reference_id in self._data.held_references
-            if index not in self._data.registry_stack_map[type(index)]:
-                raise KeyError(index)
+            # Raises a KeyError if there is no such element.
+            self._data.look_up_data(index)
             assert self._data.held_references[reference_id] == index
             self._data.access(index).release_read()
             del self._data.held_references[reference_id]
@@ -65,9 +65,7 @@ class BaseController(typing.Generic[DataInterfaceType]):
 
     def get_role_name(self, role_id: indices.RoleID) -> str:
         """Get the name of an existing role."""
-        with self._data.read(role_id) as role_data:
-            role_data: element_data.RoleData
-            return role_data.name
+        return self._data.read_attribute(role_id, 'name')
 
     def find_role(self, name: str) -> typing.Optional[indices.RoleID]:
         """Find the role with the given name and return its index. If no such role exists, return
@@ -80,9 +78,9 @@ class BaseController(typing.Generic[DataInterfaceType]):
     def add_vertex(self, preferred_role: indices.RoleID, *,
                    audit: bool = False) -> indices.VertexID:
         """Add a new vertex with the given role. Return the new vertex's index."""
-        with self._data.add(indices.VertexID, preferred_role, audit=audit) as vertex_data, \
-                self._data.read(preferred_role):
-            pass
+        # Holding the role's read lock keeps it from being removed before the vertex is added.
+        with self._data.read(preferred_role):
+            vertex_data = self._data.create(indices.VertexID, preferred_role, audit=audit)
         return vertex_data.index
 
     def remove_vertex(self, vertex_id: indices.VertexID, adjacent_edges: bool = False) -> None:
@@ -129,15 +127,11 @@ class BaseController(typing.Generic[DataInterfaceType]):
 
     def get_vertex_preferred_role(self, vertex_id: indices.VertexID) -> indices.RoleID:
         """Return the index of the role of an existing vertex."""
-        with self._data.read(vertex_id) as vertex_data:
-            vertex_data: element_data.VertexData
-            return vertex_data.preferred_role
+        return self._data.read_attribute(vertex_id, 'preferred_role')
 
     def count_vertex_outbound(self, vertex_id: indices.VertexID) -> int:
         """Return the number of outbound edges from an existing vertex."""
-        with self._data.read(vertex_id) as vertex_data:
-            vertex_data: element_data.VertexData
-            return len(vertex_data.outbound)
+        return self._data.read_attribute(vertex_id, 'outbound_count')
 
     def iter_vertex_outbound(self, vertex_id: indices.VertexID) -> typing.Iterator[indices.EdgeID]:
         """Return an iterator over the indices of the outbound edges from an existing vertex."""
@@ -147,9 +141,7 @@ class BaseController(typing.Generic[DataInterfaceType]):
 
     def count_vertex_inbound(self, vertex_id: indices.VertexID) -> int:
         """Return the number of inbound edges to an existing vertex."""
-        with self._data.read(vertex_id) as vertex_data:
-            vertex_data: element_data.VertexData
-            return len(vertex_data.inbound)
+        return self._data.read_attribute(vertex_id, 'inbound_count')
 
     def iter_vertex_inbound(self, vertex_id: indices.VertexID) -> typing.Iterator[indices.EdgeID]:
         """Return an iterator over the indices of the inbound edges to an existing vertex."""
@@ -173,15 +165,11 @@ class BaseController(typing.Generic[DataInterfaceType]):
 
     def get_label_name(self, label_id: indices.LabelID) -> str:
         """Get the name of an existing label."""
-        with self._data.read(label_id) as label_data:
-            label_data: element_data.LabelData
-            return label_data.name
+        return self._data.read_attribute(label_id, 'name')
 
     def get_label_transitivity(self, label_id: indices.LabelID) -> bool:
         """Return whether edges with this label are transitive."""
-        with self._data.read(label_id) as label_data:
-            label_data: element_data.LabelData
-            return label_data.transitive
+        return self._data.read_attribute(label_id, 'transitive')
 
     def find_label(self, name: str) -> typing.Optional[indices.LabelID]:
         """Find the label with the given name and return its index. If no such label exists, return
@@ -254,21 +242,15 @@ class BaseController(typing.Generic[DataInterfaceType]):
 
     def get_edge_label(self, edge_id: indices.EdgeID) -> indices.LabelID:
         """Get the index of an edge's label."""
-        with self._data.read(edge_id) as edge_data:
-            edge_data: element_data.EdgeData
-            return edge_data.label
+        return self._data.read_attribute(edge_id, 'label')
 
     def get_edge_source(self, edge_id: indices.EdgeID) -> indices.VertexID:
         """Get the index of an edge's source vertex."""
-        with self._data.read(edge_id) as edge_data:
-            edge_data: element_data.EdgeData
-            return edge_data.source
+        return self._data.read_attribute(edge_id, 'source')
 
     def get_edge_sink(self, edge_id: indices.EdgeID) -> indices.VertexID:
         """Get the index of an edge's sink vertex."""
-        with self._data.read(edge_id) as edge_data:
-            edge_data: element_data.EdgeData
-            return edge_data.sink
+        return self._data.read_attribute(edge_id, 'sink')
 
     def add_catalog(self, name: str, key_types: typedefs.TypeTuple = None, ordered: bool = False,
                     audit: bool = False) -> indices.CatalogID:
@@ -286,7 +268,7 @@ class BaseController(typing.Generic[DataInterfaceType]):
             allocator = allocators.MapAllocator(key_types, indices.VertexID)
         with self._data.add(indices.CatalogID, name, key_types, ordered=ordered,
                             audit=audit) as catalog_data:
-            assert catalog_data.index not in self._data.catalog_allocator_map
+            assert catalog_data.index not in self._data.catalog_allocator_stack_map
             self._data.allocate_name(name, catalog_data.index)
             with self._data.registry_lock:
                 self._data.add_catalog(catalog_data.index, allocator)
@@ -296,15 +278,14 @@ class BaseController(typing.Generic[DataInterfaceType]):
         """Remove an existing catalog."""
         with self._data.remove(catalog_id) as catalog_data:
             catalog_data: element_data.CatalogData
-            assert catalog_data.index in self._data.catalog_allocator_map
+            assert catalog_data.index in self._data.catalog_allocator_stack_map
             self._data.deallocate_name(catalog_data.name, catalog_data.index)
-            del self._data.catalog_allocator_map[catalog_data.index]
+            with self._data.registry_lock:
+                self._data.remove_catalog(catalog_data.index)
 
     def get_catalog_name(self, catalog_id: indices.CatalogID) -> str:
         """Get the name of an existing catalog."""
-        with self._data.read(catalog_id) as catalog_data:
-            catalog_data: element_data.CatalogData
-            return catalog_data.name
+        return self._data.read_attribute(catalog_id, 'name')
 
     def find_catalog(self, name: str) -> typing.Optional[indices.CatalogID]:
         """Find the catalog with the given name and return its index. If no such catalog exists,
@@ -315,14 +296,10 @@ class BaseController(typing.Generic[DataInterfaceType]):
             return catalog_data.index
 
     def get_catalog_key_types(self, catalog_id: indices.CatalogID) -> typedefs.TypeTuple:
-        with self._data.read(catalog_id) as catalog_data:
-            catalog_data: element_data.CatalogData
-            return catalog_data.key_types
+        return self._data.read_attribute(catalog_id, 'key_types')
 
     def get_catalog_ordered_flag(self, catalog_id: indices.CatalogID) -> bool:
-        with self._data.read(catalog_id) as catalog_data:
-            catalog_data: element_data.CatalogData
-            return catalog_data.is_ordered
+        return self._data.read_attribute(catalog_id, 'is_ordered')
 
     def add_catalog_entry(self, catalog_id: indices.CatalogID, key: typing.Hashable,
                           vertex_id: indices.VertexID) -> None:
@@ -403,8 +380,7 @@ class BaseController(typing.Generic[DataInterfaceType]):
     def get_audit_flag(self, index: 'PersistentIDType') -> bool:
         """Get the audit flag for the element. Modifications to the element will be recorded in the
         audit while the audit flag is set."""
-        with self._data.read(index) as element_data:
-            return element_data.audit
+        return self._data.read_attribute(index, 'audit')
 
     def get_audit_entry_count(self, index_type: typing.Type['PersistentIDType']) -> int:
         """Return the number of audit entries for the given index type."""
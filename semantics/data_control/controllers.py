@@ -99,6 +99,12 @@ class Controller(interface.BaseController[controller_data.ControllerData]):
             raise FileNotFoundError("No valid previous save files identified.")
         self._data = data
 
+    def snapshot(self) -> 'Controller':
+        """Return a read-only controller over a frozen copy of the current data. Reads through the
+        snapshot take no locks at all, so long-running readers neither wait on writers nor hold
+        them up. Changes made after the snapshot is taken are not visible through it."""
+        return Controller(data=self._data.snapshot())
+
     def new_transaction_data(self) -> transaction_data.TransactionData:
         """Create and return a new TransactionData instance for use by a new transaction."""
         return transaction_data.TransactionData(self._data)
@@ -7,6 +7,7 @@ import typing
 import semantics.data_control.base as interface
 from semantics.data_control import controllers
 from semantics.data_structs import element_data
+from semantics.data_structs import interface as data_interface
 from semantics.data_structs import transaction_data
 from semantics.data_types import allocators
 from semantics.data_types import data_access
@@ -62,35 +63,42 @@ class Transaction(interface.BaseController[transaction_data.TransactionData]):
             controller_access: typing.MutableMapping[PersistentIDType,
                                                      data_access.ThreadAccessManagerInterface]
             controller_access = self._data.controller_data.access_map[index_type]
-            deletions: typing.MutableSet[PersistentIDType]
-            deletions = self._data.pending_deletion_map[index_type]
+            deletions: typing.Iterable[PersistentIDType]
+            deletions = self._data.pending_deletion_map.get(index_type, ())
             controller_registry.update(transaction_registry)
             for index in deletions:
-                if index in controller_registry:
-                    del controller_registry[index]
+                if controller_registry.pop(index, None) is not None:
                     del self._data.access_map[index_type][index]
                     del controller_access[index]
-                    if index in self._data.controller_data.catalog_allocator_map:
-                        del self._data.controller_data.catalog_allocator_map[index]
+                    self._data.controller_data.catalog_allocator_map.pop(index, None)
             transaction_registry.clear()
-            deletions.clear()
+        self._data.pending_deletion_map.clear()
+        self._data.pending_deletion_version = 0
+        controller_usage_counts = self._data.controller_data.usage_counts
+        for index, change in self._data.usage_counts.items():
+            data_interface.add_usage_count(controller_usage_counts, index, change)
+        self._data.usage_counts.clear()
 
     def _commit_name_allocator_changes(self) -> None:
         """Update each controller name allocator by overwriting its contents with the contents of
         the transaction name allocator, canceling all name reservations made by the
         transaction, and then removing any deleted names."""
+        controller_name_allocator_map = self._data.controller_data.name_allocator_map
         transaction_name_allocator: allocators.MapAllocator
         for index_type, transaction_name_allocator in self._data.name_allocator_map.items():
-            name_allocator: allocators.MapAllocator = \
-                self._data.controller_data.name_allocator_map[index_type]
-            deletions: typing.MutableSet[str] = self._data.pending_name_deletion_map[index_type]
+            name_allocator: allocators.MapAllocator = controller_name_allocator_map[index_type]
             name_allocator.update(transaction_name_allocator, self._data)
-            name_allocator.cancel_all_reservations(self)
+            name_allocator.cancel_all_reservations(self._data)
+            transaction_name_allocator.clear()
+        # Names can be deleted without the transaction ever creating its own allocator for their
+        # index type, so the deletions are handled separately.
+        deletions: typing.Set[str]
+        for index_type, deletions in self._data.pending_name_deletion_map.items():
+            name_allocator = controller_name_allocator_map[index_type]
             for name in deletions:
                 if name_allocator.get_index(name) is not None:
                     name_allocator.deallocate(name)
-            transaction_name_allocator.clear()
-            deletions.clear()
+        self._data.pending_name_deletion_map.clear()
 
     def _commit_catalog_allocator_changes(self) -> None:
         """Update each controller catalog allocator by overwriting its contents with the contents of
@@ -104,16 +112,21 @@ class Transaction(interface.BaseController[transaction_data.TransactionData]):
                 controller_allocator = type(transaction_allocator)(transaction_allocator.key_type,
                                                                    transaction_allocator.index_type)
                 self._data.controller_data.catalog_allocator_map[index] = controller_allocator
-            deletions: typing.MutableSet[typing.Hashable] = \
-                self._data.pending_catalog_deletion_map.get(index, None)
             controller_allocator.update(transaction_allocator, self._data)
-            controller_allocator.cancel_all_reservations(self)
-            if deletions:
-                for name in deletions:
-                    if controller_allocator.get_index(name) is not None:
-                        controller_allocator.deallocate(name)
-                deletions.clear()
+            controller_allocator.cancel_all_reservations(self._data)
             transaction_allocator.clear()
+        # As with names, keys can be deleted without the transaction having its own allocator
+        # for the catalog. The catalog itself may also have been removed by now.
+        deletions: typing.Set[typing.Hashable]
+        for index, deletions in self._data.pending_catalog_deletion_map.items():
+            controller_allocator = self._data.controller_data.catalog_allocator_map.get(index, None)
+            if controller_allocator is None:
+                continue
+            for key in deletions:
+                if controller_allocator.get_index(key) is not None:
+                    controller_allocator.deallocate(key)
+        self._data.pending_catalog_deletion_map.clear()
+        self._data.removed_catalog_ids.clear()
 
     def _commit_access_changes(self) -> None:
         """Update each controller access manager by copying access managers for new elements over
@@ -152,31 +165,39 @@ class Transaction(interface.BaseController[transaction_data.TransactionData]):
 
     def _rollback_registry_changes(self) -> None:
         """Clear the transaction registry and deletion map."""
-        for index_type, transaction_registry in self._data.registry_map.items():
+        for transaction_registry in self._data.registry_map.values():
             transaction_registry.clear()
-            deletions = self._data.pending_deletion_map[index_type]
-            deletions.clear()
+        self._data.pending_deletion_map.clear()
+        self._data.pending_deletion_version = 0
+        self._data.usage_counts.clear()
 
     def _rollback_name_allocator_changes(self) -> None:
         """Clear the transaction name allocator and name deletion map."""
         for index_type, transaction_name_allocator in self._data.name_allocator_map.items():
-            deletions = self._data.pending_name_deletion_map[index_type]
             transaction_name_allocator.clear()
-            deletions.clear()
             controller_name_allocator = \
                 self._data.controller_data.name_allocator_map[index_type]
-            controller_name_allocator.cancel_all_reservations(self)
+            controller_name_allocator.cancel_all_reservations(self._data)
+        self._data.pending_name_deletion_map.clear()
 
     def _rollback_catalog_allocator_changes(self) -> None:
-        """Clear the transaction name allocator and name deletion map."""
+        """Clear the transaction catalog allocators and catalog key deletion map, and restore
+        the catalogs removed by the transaction."""
         for index, transaction_allocator in self._data.catalog_allocator_map.items():
-            deletions = self._data.pending_catalog_deletion_map.get(index, None)
-            if deletions:
-                deletions.clear()
             transaction_allocator.clear()
             controller_allocator = self._data.controller_data.catalog_allocator_map.get(index, None)
             if controller_allocator is not None:
-                controller_allocator.cancel_all_reservations(self)
+                controller_allocator.cancel_all_reservations(self._data)
+        self._data.pending_catalog_deletion_map.clear()
+        # Catalogs that were added by the transaction before being removed have nothing to
+        # restore. The others lost their transaction allocators on removal, so their reservations
+        # weren't canceled above.
+        for index in self._data.removed_catalog_ids:
+            controller_allocator = self._data.controller_data.catalog_allocator_map.get(index, None)
+            if controller_allocator is not None:
+                controller_allocator.cancel_all_reservations(self._data)
+                self._data.catalog_allocator_stack_map[index] = controller_allocator
+        self._data.removed_catalog_ids.clear()
 
     def _rollback_access_changes(self) -> None:
         """Release the locks that were acquired by the transaction access manager. If any indices
@@ -2,6 +2,7 @@
 Internal state of the controller.
 """
 
+import copy
 import threading
 import typing
 
@@ -11,6 +12,7 @@ from semantics.data_types import data_access
 from semantics.data_types import indices
 
 if typing.TYPE_CHECKING:
+    from semantics.data_structs import element_data
     from semantics.data_types import data_access
 
 
@@ -54,14 +56,15 @@ class ControllerData(interface.DataInterface[None, data_access.ControllerThreadA
         }
         self.registry_stack_map = self.registry_map
         self.pending_deletion_map = None
+        self.pending_deletion_version = 0
         self.pending_name_deletion_map = None
+        self.pending_catalog_deletion_map = None
 
         self.name_allocator_map = {
             indices.RoleID: allocators.MapAllocator(str, indices.RoleID),
             indices.LabelID: allocators.MapAllocator(str, indices.LabelID),
             indices.CatalogID: allocators.MapAllocator(str, indices.CatalogID),
         }
-        self.name_allocator_stack_map = self.name_allocator_map
 
         self.catalog_allocator_map = {}
         self.catalog_allocator_stack_map = self.catalog_allocator_map
@@ -73,6 +76,9 @@ class ControllerData(interface.DataInterface[None, data_access.ControllerThreadA
         state = self.__dict__.copy()
         for name in self.__NON_PERSISTENT_ATTRIBUTES:
             del state[name]
+        # Being a snapshot is a property of the copy in memory, not of the data, so saving a
+        # snapshot doesn't produce a database that can never be modified again.
+        state.pop('is_snapshot', None)
         return state
 
     def __setstate__(self, state):
@@ -80,6 +86,50 @@ class ControllerData(interface.DataInterface[None, data_access.ControllerThreadA
         self.held_references = {}
         self.held_references_union = self.held_references.keys()
         self.registry_lock = threading.Lock()
+        # Saved before these attributes were added (or, for the name allocator stack map,
+        # removed).
+        self.__dict__.setdefault('pending_deletion_version', 0)
+        self.__dict__.setdefault('pending_catalog_deletion_map', None)
+        self.__dict__.pop('name_allocator_stack_map', None)
+        self.__dict__.pop('is_snapshot', None)
+        if 'usage_counts' not in state:
+            # Saved before usage counts were tracked.
+            with self.registry_lock:
+                self.count_all_usages()
+
+    def snapshot(self) -> 'ControllerData':
+        """Return a frozen copy of the data for read-only use. Reads from the snapshot don't
+        acquire any element locks, since nothing can change it, and attempts to add, update, or
+        remove elements, names, or catalogs in it, or to open a transaction on it, raise an
+        exception."""
+        snapshot = ControllerData()
+        # Registry entries are replaced rather than modified in place, and element data is
+        # copy-on-write, so copying the containers is enough to freeze them. These are pointer
+        # copies, which keeps the time spent holding the registry lock short. The access managers
+        # are shared, since the snapshot never locks them, and only their indices are saved.
+        with self.registry_lock:
+            snapshot.reference_id_allocator = copy.copy(self.reference_id_allocator)
+            snapshot.id_allocator_map = {index_type: copy.copy(allocator)
+                                         for index_type, allocator in self.id_allocator_map.items()}
+            snapshot.registry_map = {index_type: registry.copy()
+                                     for index_type, registry in self.registry_map.items()}
+            snapshot.access_map = {index_type: access.copy()
+                                   for index_type, access in self.access_map.items()}
+            snapshot.audit_map = {index_type: audit.copy()
+                                  for index_type, audit in self.audit_map.items()}
+            snapshot.usage_counts = self.usage_counts.copy()
+            snapshot.name_allocator_map = {
+                index_type: allocator.copy()
+                for index_type, allocator in self.name_allocator_map.items()
+            }
+            snapshot.catalog_allocator_map = {
+                catalog_id: allocator.copy()
+                for catalog_id, allocator in self.catalog_allocator_map.items()
+            }
+        snapshot.registry_stack_map = snapshot.registry_map
+        snapshot.catalog_allocator_stack_map = snapshot.catalog_allocator_map
+        snapshot.is_snapshot = True
+        return snapshot
 
     def access(self, index: 'PersistentIDType') -> 'data_access.ThreadAccessManagerInterface':
         """Return the thread access manager with the given index. Raise a KeyError if
@@ -95,31 +145,79 @@ class ControllerData(interface.DataInterface[None, data_access.ControllerThreadA
 
     def allocate_name(self, name: str, index: 'PersistentIDType') -> None:
         """Allocate a new name for the index."""
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         allocator = self.name_allocator_map[type(index)]
         allocator.allocate(name, index)
 
     def deallocate_name(self, name: str, index: 'PersistentIDType') -> None:
         """Deallocate the name from the index."""
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         allocator = self.name_allocator_map[type(index)]
         assert allocator.get_index(name) == index
         allocator.deallocate(name)
 
+    def look_up_name(self, index_type: typing.Type['PersistentIDType'],
+                     name: str) -> typing.Optional['PersistentIDType']:
+        """Return the index the name is assigned to, if any."""
+        return self.name_allocator_map[index_type].get_index(name)
+
+    def look_up_data(self, index: 'PersistentIDType') \
+            -> 'element_data.ElementData[PersistentIDType]':
+        """Return the registry entry for the index, without copying it. Raise a KeyError if
+        there is none."""
+        return self.registry_map[type(index)][index]
+
+    def look_up_catalog_key(self, catalog_id: 'indices.CatalogID',
+                            key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index the key is assigned to in the catalog, if any."""
+        return self.catalog_allocator_map[catalog_id].get_index(key)
+
+    def look_up_nearest_catalog_key(self, catalog_id: 'indices.CatalogID',
+                                    key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index assigned to the key in the catalog or, if there is none, to the
+        nearest key following it, or failing that, to the last key. Return None if the catalog is
+        empty."""
+        allocator = self.catalog_allocator_map[catalog_id]
+        if not isinstance(allocator, allocators.OrderedMapAllocator):
+            raise ValueError('Unordered catalog does not support `nearest` flag.')
+        return allocator.get(key, nearest=True)
+
     def allocate_catalog_key(self, catalog_id: 'indices.CatalogID', key: typing.Hashable,
                              index: 'indices.VertexID') -> None:
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         assert self.registry_lock.locked()
-        with self.access(catalog_id).read_lock:
-            allocator = self.catalog_allocator_map[catalog_id]
-            allocator.allocate(key, index)
+        access_manager = self.access(catalog_id)
+        access_manager.acquire_read()
+        try:
+            self.catalog_allocator_map[catalog_id].allocate(key, index)
+        finally:
+            access_manager.release_read()
 
     def deallocate_catalog_key(self, catalog_id: 'indices.CatalogID', key: typing.Hashable) -> None:
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         assert self.registry_lock.locked()
-        with self.access(catalog_id).read_lock:
+        access_manager = self.access(catalog_id)
+        access_manager.acquire_read()
+        try:
             allocator = self.catalog_allocator_map[catalog_id]
             assert key in allocator
             allocator.deallocate(key)
+        finally:
+            access_manager.release_read()
 
     def add_catalog(self, catalog_id: 'indices.CatalogID', allocator: ...) -> None:
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         assert self.registry_lock.locked()
         assert catalog_id not in self.catalog_allocator_map
         self.catalog_allocator_map[catalog_id] = allocator
-        self.catalog_allocator_stack_map[catalog_id] = allocator
+
+    def remove_catalog(self, catalog_id: 'indices.CatalogID') -> None:
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
+        assert self.registry_lock.locked()
+        del self.catalog_allocator_map[catalog_id]
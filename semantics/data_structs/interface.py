@@ -5,6 +5,7 @@ Shared interface provided by both controller data and transaction data.
 import abc
 import collections
 import threading
+import types
 import typing
 
 import semantics.data_structs.operation_contexts as contexts
@@ -23,22 +24,44 @@ ParentControllerDataType = typing.TypeVar('ParentControllerDataType', bound=Pare
 
 FixedNameElementID = typing.Union[indices.RoleID, indices.LabelID, indices.CatalogID]
 
+# For each index type whose elements hold a persistent reference to another element, the name of
+# the element data attribute holding it. Only vertices (to their roles) and edges (to their labels)
+# hold references this way.
+_REFERENCE_ATTRIBUTES = {
+    indices.VertexID: 'preferred_role',
+    indices.EdgeID: 'label',
+}
+
+
+def add_usage_count(usage_counts: typing.Dict[indices.PersistentDataID, int],
+                    index: indices.PersistentDataID, change: int) -> None:
+    """Add the change to the usage count for the index, dropping the entry if it reaches zero."""
+    count = usage_counts.get(index, 0) + change
+    if count:
+        usage_counts[index] = count
+    else:
+        del usage_counts[index]
+
 
 class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManagerType],
                     metaclass=abc.ABCMeta):
     """Abstract base class for database data container classes."""
 
+    # Subclasses choose for themselves whether to have an instance dict. (ControllerData keeps
+    # one for pickling; TransactionData doesn't need one.)
+    __slots__ = ()
+
     controller_data: typing.Optional[ParentControllerDataType]
 
     element_type_map: typing.Mapping[typing.Type[indices.PersistentDataID],
                                      typing.Type[element_data.ElementData]]
-    element_type_map = {
+    element_type_map = types.MappingProxyType({
         indices.RoleID: element_data.RoleData,
         indices.VertexID: element_data.VertexData,
         indices.LabelID: element_data.LabelData,
         indices.EdgeID: element_data.EdgeData,
         indices.CatalogID: element_data.CatalogData,
-    }
+    })
 
     reference_id_allocator: allocators.IndexAllocator[indices.ReferenceID]
     id_allocator_map: typing.Mapping[typing.Type[indices.PersistentDataID],
@@ -55,19 +78,29 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
                                typing.MutableMapping[indices.PersistentDataID,
                                                      ThreadAccessManagerType]]
 
+    # Pending deletions are kept in a separate set for each index type, rather than in one flat
+    # set. Indices of different types with the same value hash alike, so a flat set would fall
+    # back on UniqueID's Python-level __eq__ for every cross-type collision. The sets are only
+    # created once something of that type is marked for deletion, since most transactions
+    # never delete anything.
     pending_deletion_map: typing.Optional[
-        typing.Mapping[typing.Type[indices.PersistentDataID],
-                       typing.MutableSet[indices.PersistentDataID]]
+        typing.MutableMapping[typing.Type[indices.PersistentDataID],
+                              typing.MutableSet[indices.PersistentDataID]]
     ]
+    # Bumped each time an element, name, or catalog key is marked for deletion, and reset to zero
+    # when the pending deletions are cleared, so a single integer test rules out the common case
+    # where nothing is pending.
+    pending_deletion_version: int
     pending_name_deletion_map: typing.Optional[
         typing.MutableMapping[typing.Type[indices.PersistentDataID],
                               typing.MutableSet[str]]
     ]
+    pending_catalog_deletion_map: typing.Optional[
+        typing.MutableMapping[indices.CatalogID, typing.MutableSet[typing.Hashable]]
+    ]
 
     name_allocator_map: typing.Mapping[typing.Type[FixedNameElementID],
                                        allocators.MapAllocator[str, indices.PersistentDataID]]
-    name_allocator_stack_map: typing.Mapping[typing.Type[FixedNameElementID],
-                                             typing.Mapping[str, indices.PersistentDataID]]
 
     catalog_allocator_map: typing.Dict[indices.CatalogID,
                                        allocators.MapAllocator[typing.Hashable, indices.VertexID]]
@@ -78,9 +111,19 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
     audit_map: typing.Mapping[typing.Type[indices.PersistentDataID],
                               typing.Deque[indices.PersistentDataID]]
 
+    # The number of references to each role and label from vertices and edges. Elements with no
+    # references are omitted. For transactions, these are net changes relative to the controller's
+    # counts, and may be negative.
+    usage_counts: typing.Dict[indices.PersistentDataID, int]
+
     # Protects object creation, deletion, and reference count changes
     registry_lock: threading.Lock
 
+    # Whether this is a frozen, read-only copy of controller data. Nothing can change a snapshot,
+    # so reads from it take no locks at all: neither the registry lock nor the element locks of
+    # the thread access managers.
+    is_snapshot: bool = False
+
     def __init__(self):
         self.access_map = {
             indices.RoleID: {},
@@ -96,6 +139,7 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
             indices.EdgeID: collections.deque(),
             indices.CatalogID: collections.deque(),
         }
+        self.usage_counts = {}
 
     def add(self, index_type: typing.Type['PersistentIDType'], *args, **kwargs) \
             -> 'typing.ContextManager[element_data.ElementData[PersistentIDType]]':
@@ -111,8 +155,42 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
                 # it is added to the database. If an exception is raised here,
                 # the element won't be added.
         """
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         return contexts.Adding(self, index_type, *args, **kwargs)
 
+    def create(self, index_type: typing.Type['PersistentIDType'], *args, **kwargs) \
+            -> 'element_data.ElementData[PersistentIDType]':
+        """Add a new element of the given type immediately, and return its element
+        data. This is equivalent to an empty `with data.add(...)` block, without
+        the overhead of the context manager.
+
+        Note: Do not hold the registry lock while calling this method.
+        """
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
+        return contexts.add(self, index_type, *args, **kwargs)
+
+    def add_batch(self, index_type: typing.Type['PersistentIDType']) \
+            -> 'typing.ContextManager[typing.Callable[..., element_data.ElementData]]':
+        """A context manager which adds any number of new elements of the given type
+        if no exceptions occur in the `with` body. The registry lock is acquired
+        once for the whole batch, rather than once per element.
+
+        Note: Do not hold the registry lock while calling this method.
+
+        Usage:
+            with data.add_batch(VertexID) as add:
+                for role_id in role_ids:
+                    element_data = add(role_id)
+                    assert isinstance(element_data, VertexData)
+                # If an exception is raised here, none of the elements will be
+                # added.
+        """
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
+        return contexts.BatchAdding(self, index_type)
+
     def read(self, index: 'PersistentIDType') \
             -> 'typing.ContextManager[element_data.ElementData[PersistentIDType]]':
         """A context manager which provides read access to a data element and revokes
@@ -127,6 +205,20 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
         """
         return contexts.Reading(self, index)
 
+    def read_attribute(self, index: 'PersistentIDType', attribute: str) -> typing.Any:
+        """Return the value of an attribute of a data element, holding a read lock on the element
+        only while the attribute is retrieved. This is equivalent to retrieving the attribute in a
+        `with data.read(index)` block, but avoids the context manager and copy of the element. It
+        is only meant for attributes holding immutable values, such as names and indices.
+
+        Note: Do not hold the registry lock while calling this method.
+        """
+        registry_entry, access_manager = contexts.acquire_read(self, index)
+        try:
+            return getattr(registry_entry, attribute)
+        finally:
+            contexts.release_read(self, access_manager)
+
     def update(self, index: 'PersistentIDType') \
             -> 'typing.ContextManager[element_data.ElementData[PersistentIDType]]':
         """A context manager which provides update (modify) access to a data element
@@ -142,6 +234,8 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
                 # raised, the changes will be applied. Otherwise, they will be
                 # rolled back.
         """
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         return contexts.Updating(self, index)
 
     def find(self, index_type: typing.Type['PersistentIDType'], name: str) \
@@ -190,6 +284,8 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
                 # raised, the element will be deleted. Otherwise, the changes will be
                 # rolled back.
         """
+        if self.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         return contexts.Removing(self, index)
 
     def get_data(self, index: 'PersistentIDType') -> 'element_data.ElementData[PersistentIDType]':
@@ -199,9 +295,11 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
         Note: The registry lock must be held while calling this method.
         """
         assert self.registry_lock.locked()
-        if self.pending_deletion_map and index in self.pending_deletion_map[type(index)]:
+        index_type = type(index)
+        if self.pending_deletion_version and \
+                index in self.pending_deletion_map.get(index_type, ()):
             raise KeyError(index)
-        return self.registry_stack_map[type(index)][index]
+        return self.look_up_data(index)
 
     @abc.abstractmethod
     def access(self, index: 'PersistentIDType') -> ThreadAccessManagerType:
@@ -228,40 +326,68 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
         # Do a basic check to make sure the method isn't being abused.
         # (The caller can still mistakenly drop the lock during iteration.)
         assert self.registry_lock.locked()
-        if self.pending_deletion_map:
-            pending_deletions = self.pending_deletion_map[index_type]
-            yield from (self.registry_map[index_type].keys() |
-                        self.controller_data.registry_map[index_type].keys()) - pending_deletions
+        if self.pending_deletion_map is not None:
+            all_indices = (self.registry_map[index_type].keys() |
+                           self.controller_data.registry_map[index_type].keys())
+            pending_deletions = self.pending_deletion_map.get(index_type)
+            if pending_deletions:
+                all_indices -= pending_deletions
+            yield from all_indices
         else:
             yield from self.registry_map[index_type]
 
-    def is_in_use(self, index: 'PersistentIDType') -> bool:
-        """Check if there are any references to the element from other elements.
+    def iter_all_data(self, index_type: typing.Type['PersistentIDType']) \
+            -> typing.Iterator['element_data.ElementData[PersistentIDType]']:
+        """Return an iterator over the data of all existing elements of the given type.
 
         Note: The registry lock must be held while calling this method.
 
         WARNING: This is an expensive operation that requires traversing a large
         portion of the database while holding the registry lock. Do not use it
         for trivial purposes!"""
-        # This is one case where we want to do identity comparison for types,
-        # because we are using the actual types as keys in a dictionary. We
-        # won't be making any subclasses of RoleID or LabelID, and their whole
-        # reason for existence is to distinguish them by exact type.
-        # pylint: disable=C0123
-        if type(index) is indices.RoleID:
-            for referring_index in self.iter_all(indices.VertexID):
-                referring_data = self.get_data(referring_index)
-                assert isinstance(referring_data, element_data.VertexData)
-                if referring_data.preferred_role == index:
-                    return True
-        elif type(index) is indices.LabelID:
-            for referring_index in self.iter_all(indices.EdgeID):
-                referring_data = self.get_data(referring_index)
-                assert isinstance(referring_data, element_data.EdgeData)
-                if referring_data.label == index:
-                    return True
-        # We never hold persistent references from other elements to vertices or edges.
-        return False
+        # Unlike iter_all(), this walks the registries' values directly, rather than
+        # looking up each index again via get_data().
+        assert self.registry_lock.locked()
+        registry = self.registry_map[index_type]
+        yield from registry.values()
+        if self.pending_deletion_map is not None:
+            pending_deletions = self.pending_deletion_map.get(index_type, ())
+            for index, data in self.controller_data.registry_map[index_type].items():
+                # Entries in the transaction registry shadow those in the controller.
+                if index not in registry and index not in pending_deletions:
+                    yield data
+
+    def is_in_use(self, index: 'PersistentIDType') -> bool:
+        """Check if there are any references to the element from other elements.
+
+        Note: The registry lock must be held while calling this method."""
+        assert self.registry_lock.locked()
+        count = self.usage_counts.get(index, 0)
+        if self.controller_data is not None:
+            count += self.controller_data.usage_counts.get(index, 0)
+        return count > 0
+
+    def count_usage(self, data: 'element_data.ElementData', change: int) -> None:
+        """Adjust the usage count of the element referenced by the given element data, if any.
+        This is called with a change of 1 when the element is added, and -1 when it is removed.
+
+        Note: The registry lock must be held while calling this method."""
+        assert self.registry_lock.locked()
+        attribute = _REFERENCE_ATTRIBUTES.get(type(data.index))
+        if attribute is None:
+            return
+        add_usage_count(self.usage_counts, getattr(data, attribute), change)
+
+    def count_all_usages(self) -> None:
+        """Recompute the usage counts from scratch by scanning the registries. Used when
+        loading data saved before usage counts were tracked.
+
+        Note: The registry lock must be held while calling this method."""
+        assert self.registry_lock.locked()
+        self.usage_counts = {}
+        for index_type in (indices.VertexID, indices.EdgeID):
+            for data in self.iter_all_data(index_type):
+                self.count_usage(data, 1)
 
     @abc.abstractmethod
     def allocate_name(self, name: str, index: 'PersistentIDType') -> None:
@@ -273,6 +399,36 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
         """Remove a name/index assignment."""
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def look_up_name(self, index_type: typing.Type['PersistentIDType'],
+                     name: str) -> typing.Optional['PersistentIDType']:
+        """Return the index the name is assigned to, if any. This ignores pending name
+        deletions."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def look_up_data(self, index: 'PersistentIDType') \
+            -> 'element_data.ElementData[PersistentIDType]':
+        """Return the registry entry for the index, without copying it. Raise a KeyError if
+        there is none. This ignores pending deletions."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def look_up_catalog_key(self, catalog_id: 'indices.CatalogID',
+                            key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index the key is assigned to in the catalog, if any. This ignores
+        pending catalog key deletions."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def look_up_nearest_catalog_key(self, catalog_id: 'indices.CatalogID',
+                                    key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index assigned to the key in the catalog or, if there is none, to the
+        nearest key following it, or failing that, to the last key. Return None if the catalog is
+        empty. Raise a ValueError if the catalog is unordered, and a KeyError if it doesn't
+        exist."""
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def allocate_catalog_key(self, catalog_id: 'indices.CatalogID', key: typing.Hashable,
                              index: 'indices.VertexID') -> None:
@@ -287,3 +443,7 @@ class DataInterface(typing.Generic[ParentControllerDataType, ThreadAccessManager
     @abc.abstractmethod
     def add_catalog(self, catalog_id: 'indices.CatalogID', allocator: ...) -> None:
         raise NotImplementedError()
+
+    @abc.abstractmethod
+    def remove_catalog(self, catalog_id: 'indices.CatalogID') -> None:
+        raise NotImplementedError()
@@ -4,11 +4,11 @@ interacts with its data. They also serve as convenient generalizations across Gr
 for the various operations the ControllerInterface needs to perform on them."""
 
 import abc
-import copy
 import typing
 
 from semantics.data_structs import element_data
-from semantics.data_types import exceptions, allocators
+from semantics.data_types import exceptions
+from semantics.data_types import data_access
 from semantics.data_types import indices
 
 if typing.TYPE_CHECKING:
@@ -17,10 +17,50 @@ if typing.TYPE_CHECKING:
 
 PersistentIDType = typing.TypeVar('PersistentIDType', bound=indices.PersistentDataID)
 
+def _register_new_element(data: 'interface.DataInterface',
+                          index_type: typing.Type[PersistentIDType],
+                          new_data: 'element_data.ElementData[PersistentIDType]') -> None:
+    """Add a newly created element's data to the registry of the database or transaction."""
+    index = new_data.index
+    # Put a copy into the registry so that if someone misbehaves and keeps a reference to
+    # the data handed back to the caller, they can't affect the registry with it. Neither
+    # the copy nor the new access manager depends on shared state, so we build them before
+    # taking the registry lock to keep the critical section short.
+    registry_entry = new_data.copy()
+    # It doesn't matter if it's a controller or a transaction. There is no pre-existing
+    # copy of the data, so we have to create it.
+    new_access = data.new_access(index)
+    with data.registry_lock:
+        registry = data.registry_map[index_type]
+        assert index not in registry
+        access = data.access_map[index_type]
+        assert index not in access
+        registry[index] = registry_entry
+        access[index] = new_access
+        data.count_usage(new_data, 1)
+        if new_data.audit:
+            data.audit_map[index_type].append(index)
+
+
+def add(data: 'interface.DataInterface', index_type: typing.Type[PersistentIDType],
+        *args, **kwargs) -> 'element_data.ElementData[PersistentIDType]':
+    """Create a new element and add it to the database or transaction in one step, returning its
+    element data. This is what Adding does, for callers that have nothing to validate between
+    creating the element and adding it, and so have no need for a context manager.
+
+    Note: Do not hold the registry lock while calling this function.
+    """
+    index = data.id_allocator_map[index_type].new_id()
+    new_data = data.element_type_map[index_type](index, *args, **kwargs)
+    _register_new_element(data, index_type, new_data)
+    return new_data
+
 
 class Adding(typing.Generic[PersistentIDType]):
     """Context manager for adding an element to the database."""
 
+    __slots__ = ('_data', '_index_type', '_element_data', '_args', '_kwargs')
+
     def __init__(self, data: 'interface.DataInterface', index_type: typing.Type[PersistentIDType],
                  *args, **kwargs):
         self._data = data
@@ -32,26 +72,17 @@ class Adding(typing.Generic[PersistentIDType]):
     def _begin(self):
         """Begin adding an element to the database or transaction."""
         assert self._element_data is None
-        index = self._data.id_allocator_map[self._index_type].new_id()
-        self._element_data = self._data.element_type_map[self._index_type](index, *self._args,
-                                                                           **self._kwargs)
+        data = self._data
+        index_type = self._index_type
+        index = data.id_allocator_map[index_type].new_id()
+        element_type = data.element_type_map[index_type]
+        self._element_data = element_type(index, *self._args, **self._kwargs)
 
     def _commit(self):
         """Add the new element to the database or transaction."""
-        assert self._element_data
-        with self._data.registry_lock:
-            registry = self._data.registry_map[self._index_type]
-            assert self._element_data.index not in registry
-            access = self._data.access_map[self._index_type]
-            assert self._element_data.index not in access
-            # Put a copy into the registry so that if someone misbehaves and keeps a reference to
-            # the data returned by the context manager, they can't affect the registry with it.
-            registry[self._element_data.index] = copy.copy(self._element_data)
-            # It doesn't matter if it's a controller or a transaction. There is no pre-existing
-            # copy of the data, so we have to create it.
-            access[self._element_data.index] = self._data.new_access(self._element_data.index)
-            if self._element_data.audit:
-                self._data.audit_map[self._index_type].append(self._element_data.index)
+        new_data = self._element_data
+        assert new_data
+        _register_new_element(self._data, self._index_type, new_data)
         self._element_data = None
 
     def _rollback(self):
@@ -70,69 +101,180 @@ class Adding(typing.Generic[PersistentIDType]):
             self._rollback()
 
 
+class BatchAdding(typing.Generic[PersistentIDType]):
+    """Context manager for adding many elements of the same type to the database at once. The
+    registry lock is acquired only once, when the whole batch is committed."""
+
+    __slots__ = ('_data', '_index_type', '_batch', '_new_id', '_element_type')
+
+    def __init__(self, data: 'interface.DataInterface', index_type: typing.Type[PersistentIDType]):
+        self._data = data
+        self._index_type = index_type
+        self._batch: typing.List[element_data.ElementData[PersistentIDType]] = []
+        # Bound once here, rather than looked up for every element in the batch.
+        self._new_id: typing.Optional[typing.Callable[[], PersistentIDType]] = \
+            data.id_allocator_map[index_type].new_id
+        self._element_type: typing.Optional[typing.Type[element_data.ElementData]] = \
+            data.element_type_map[index_type]
+
+    def _add(self, *args, **kwargs) -> 'element_data.ElementData[PersistentIDType]':
+        """Create a new element and append it to the batch. Return its element data, which may be
+        modified until the batch is committed."""
+        new_data = self._element_type(self._new_id(), *args, **kwargs)
+        self._batch.append(new_data)
+        return new_data
+
+    def _commit(self):
+        """Add the new elements to the database or transaction."""
+        data = self._data
+        # As in Adding, the registry copies and access managers are built before the registry
+        # lock is taken.
+        entries = [(new_data.index, new_data.copy(), data.new_access(new_data.index))
+                   for new_data in self._batch]
+        audited = [new_data.index for new_data in self._batch if new_data.audit]
+        with data.registry_lock:
+            registry = data.registry_map[self._index_type]
+            access = data.access_map[self._index_type]
+            for index, registry_entry, new_access in entries:
+                assert index not in registry
+                assert index not in access
+                registry[index] = registry_entry
+                access[index] = new_access
+                data.count_usage(registry_entry, 1)
+            if audited:
+                data.audit_map[self._index_type].extend(audited)
+
+    def __enter__(self) -> typing.Callable[..., 'element_data.ElementData[PersistentIDType]']:
+        assert not self._batch
+        return self._add
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self._commit()
+        self._batch = []
+
+
+def acquire_read(data: 'interface.DataInterface', index: PersistentIDType) \
+        -> typing.Tuple['element_data.ElementData[PersistentIDType]',
+                        typing.Optional[data_access.ThreadAccessManagerInterface]]:
+    """Acquire a read lock on an element and return its registry entry together with the access
+    manager to pass to release_read() afterward. This is what Reading does on entry, for hot paths
+    that don't need a context manager. The registry entry is not copied, so it must not be
+    modified.
+
+    Note: Do not hold the registry lock while calling this function.
+    """
+    index_type = type(index)
+    if data.is_snapshot:
+        return data.registry_map[index_type][index], None
+    with data.registry_lock:
+        if data.pending_deletion_version and \
+                index in data.pending_deletion_map.get(index_type, ()):
+            raise KeyError(index)
+        # Look the element up before taking the read lock, so a missing element fails without
+        # anything to undo. The lock is taken while still holding the registry lock; that's
+        # cheap, since the access manager's acquire_read() never waits, and is what keeps it from
+        # racing a removal.
+        registry_entry = data.look_up_data(index)
+        access_manager = data.access(index)
+        access_manager.acquire_read()
+    return registry_entry, access_manager
+
+
+def release_read(data: 'interface.DataInterface',
+                 access_manager: typing.Optional[data_access.ThreadAccessManagerInterface]) -> None:
+    """Release a read lock acquired with acquire_read(). The access manager is None for
+    snapshots, which are never locked.
+
+    Note: Do not hold the registry lock while calling this function.
+    """
+    if access_manager is not None:
+        with data.registry_lock:
+            access_manager.release_read()
+
+
 class Reading(typing.Generic[PersistentIDType]):
     """Context manager for gaining read access to an element in the database using index lookup."""
 
+    __slots__ = ('_data', '_index', '_element_data', '_access_manager')
+
     def __init__(self, data: 'interface.DataInterface', index: PersistentIDType):
         self._data = data
         self._index = index
         self._element_data: typing.Optional[element_data.ElementData] = None
+        self._access_manager: typing.Optional[data_access.ThreadAccessManagerInterface] = None
 
     def __enter__(self) -> 'element_data.ElementData[PersistentIDType]':
-        with self._data.registry_lock:
-            if self._data.pending_deletion_map and \
-                    self._index in self._data.pending_deletion_map[type(self._index)]:
-                raise KeyError(self._index)
-            self._data.access(self._index).acquire_read()
-            registry_entry = self._data.registry_stack_map[type(self._index)][self._index]
+        registry_entry, self._access_manager = acquire_read(self._data, self._index)
         self._element_data = registry_entry
         # Ensures changes to the element data will have no lasting effect
-        return copy.copy(registry_entry)
+        return registry_entry.copy()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         assert self._element_data is not None
-        with self._data.registry_lock:
-            self._data.access(self._element_data.index).release_read()
-        self._element_data = None
+        # We hang onto the access manager from __enter__ so we don't have to look it up again.
+        release_read(self._data, self._access_manager)
+        self._element_data = self._access_manager = None
 
 
 class Finding(typing.Generic[PersistentIDType]):
     """Context manager for gaining read access to an element in the database using name lookup."""
 
+    __slots__ = ('_data', '_index_type', '_name', '_element_data', '_access_manager')
+
     def __init__(self, data: 'interface.DataInterface', index_type: typing.Type[PersistentIDType],
                  name: str):
         self._data = data
         self._index_type = index_type
         self._name = name
         self._element_data = None
+        self._access_manager: typing.Optional[data_access.ThreadAccessManagerInterface] = None
 
     def __enter__(self) -> typing.Optional[element_data.ElementData[PersistentIDType]]:
         assert self._element_data is None
-        with self._data.registry_lock:
-            if self._data.pending_name_deletion_map and \
-                    self._name in self._data.pending_name_deletion_map[self._index_type]:
+        data = self._data
+        name = self._name
+        index_type = self._index_type
+        if data.is_snapshot:
+            index = data.look_up_name(index_type, name)
+            if index is None:
+                return None
+            registry_entry = data.registry_map[index_type][index]
+            self._element_data = registry_entry
+            return registry_entry.copy()
+        with data.registry_lock:
+            index = data.look_up_name(index_type, name)
+            if index is None:
                 return None
-            index = self._data.name_allocator_stack_map[self._index_type].get(self._name)
-            if index is None or (self._data.pending_deletion_map and
-                                 index in self._data.pending_deletion_map[self._index_type]):
+            # Name and element deletions both bump the version, so one test skips both checks
+            # for controllers and for transactions with nothing pending.
+            if data.pending_deletion_version and \
+                    (name in data.pending_name_deletion_map.get(index_type, ()) or
+                     index in data.pending_deletion_map.get(index_type, ())):
                 return None
-            self._data.access(index).acquire_read()
-            registry_entry = self._data.registry_stack_map[self._index_type][index]
+            # Look up before locking, as in acquire_read().
+            registry_entry = data.look_up_data(index)
+            access_manager = data.access(index)
+            access_manager.acquire_read()
         self._element_data = registry_entry
+        self._access_manager = access_manager
         # Ensures changes to the element data will have no lasting effect
-        return copy.copy(registry_entry)
+        return registry_entry.copy()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # The element data can be None if there was no element found with the given name.
-        if self._element_data is not None:
+        # The access manager can be None if there was no element found with the given name, or
+        # if the data is a snapshot.
+        if self._access_manager is not None:
             with self._data.registry_lock:
-                self._data.access(self._element_data.index).release_read()
-        self._element_data = None
+                self._access_manager.release_read()
+        self._element_data = self._access_manager = None
 
 
 class FindingInCatalog:
     """Context manager for gaining read access to a vertex in the database using catalog lookup."""
 
+    __slots__ = ('_data', '_catalog_id', '_key', '_nearest', '_vertex_data', '_access_manager')
+
     def __init__(self, data: 'interface.DataInterface', catalog_id: 'indices.CatalogID',
                  key: typing.Hashable, *, nearest: bool = False):
         self._data = data
@@ -140,107 +282,159 @@ class FindingInCatalog:
         self._key = key
         self._nearest = nearest
         self._vertex_data = None
+        self._access_manager: typing.Optional[data_access.ThreadAccessManagerInterface] = None
+
+    def _look_up(self, data: 'interface.DataInterface') -> typing.Optional['indices.VertexID']:
+        """Look up the key in the catalog and return the associated vertex index, if any."""
+        if self._nearest:
+            return data.look_up_nearest_catalog_key(self._catalog_id, self._key)
+        if data.pending_deletion_version and \
+                self._key in data.pending_catalog_deletion_map.get(self._catalog_id, ()):
+            return None
+        return data.look_up_catalog_key(self._catalog_id, self._key)
 
     def __enter__(self) -> typing.Optional[element_data.VertexData]:
         assert self._vertex_data is None
-        with self._data.registry_lock:
-            with self._data.access(self._catalog_id).read_lock:
-                allocator: allocators.MapAllocator[typing.Hashable, indices.VertexID]
-                allocator = self._data.catalog_allocator_stack_map[self._catalog_id]
-                if self._nearest:
-                    if not isinstance(allocator, allocators.OrderedMapAllocator):
-                        raise ValueError('Unordered catalog does not support `nearest` flag.')
-                    index = allocator.get(self._key, nearest=self._nearest)
-                else:
-                    index = allocator.get(self._key)
-            if index is None or (self._data.pending_deletion_map and
-                                 index in self._data.pending_deletion_map[indices.VertexID]):
+        data = self._data
+        if data.is_snapshot:
+            index = self._look_up(data)
+            if index is None:
                 return None
-            self._data.access(index).acquire_read()
-            registry_entry = self._data.registry_stack_map[indices.VertexID][index]
-            assert isinstance(registry_entry, element_data.VertexData)
+            registry_entry = data.registry_map[indices.VertexID][index]
+            self._vertex_data = registry_entry
+            return registry_entry.copy()
+        with data.registry_lock:
+            # Calling the catalog's access manager directly spares building a lock context
+            # manager just for this lookup.
+            catalog_access_manager = data.access(self._catalog_id)
+            catalog_access_manager.acquire_read()
+            try:
+                index = self._look_up(data)
+            finally:
+                catalog_access_manager.release_read()
+            if index is None or (data.pending_deletion_version and
+                                 index in data.pending_deletion_map.get(indices.VertexID, ())):
+                return None
+            # Look up before locking, as in acquire_read().
+            registry_entry = data.look_up_data(index)
+            access_manager = data.access(index)
+            access_manager.acquire_read()
+        assert isinstance(registry_entry, element_data.VertexData)
         self._vertex_data = registry_entry
+        self._access_manager = access_manager
         # Ensures changes to the vertex data will have no lasting effect
-        return copy.copy(registry_entry)
+        return registry_entry.copy()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # The vertex data can be None if there was no vertex found with the given time stamp.
-        if self._vertex_data is not None:
+        # The access manager can be None if there was no vertex found with the given key, or if
+        # the data is a snapshot.
+        if self._access_manager is not None:
             with self._data.registry_lock:
-                self._data.access(self._vertex_data.index).release_read()
-        self._vertex_data = None
+                self._access_manager.release_read()
+        self._vertex_data = self._access_manager = None
 
 
 class WriteAccessContextBase(typing.Generic[PersistentIDType], abc.ABC):
     """Base class for context managers for gaining write access to an element in the database."""
 
+    __slots__ = ('_data', '_index', '_index_type', '_registry', '_controller_registry',
+                 '_controller_element_data', '_transaction_element_data', '_temporary_element_data',
+                 '_access_manager')
+
+    # Whether the element must be unused by other elements for access to be granted.
+    _CHECK_IN_USE: bool = False
+
     def __init__(self, data: 'interface.DataInterface', index: PersistentIDType):
         assert index is not None
         self._data = data
         self._index = index
+        index_type = self._index_type = type(index)
+        # The registries are cleared but never replaced, so they can be looked up here, ahead of
+        # time, instead of while holding the registry lock.
+        self._registry: typing.Optional[typing.Dict[PersistentIDType, element_data.ElementData]] = \
+            data.registry_map[index_type]
+        self._controller_registry: \
+            typing.Optional[typing.Dict[PersistentIDType, element_data.ElementData]] = \
+            None if data.controller_data is None else data.controller_data.registry_map[index_type]
         self._controller_element_data: typing.Optional[element_data.ElementData] = None
         self._transaction_element_data: typing.Optional[element_data.ElementData] = None
         self._temporary_element_data: typing.Optional[element_data.ElementData] = None
+        self._access_manager: typing.Optional[data_access.ThreadAccessManagerInterface] = None
 
-    @abc.abstractmethod
-    def _early_validation(self):
-        """Perform early checks to verify that the requested access can be granted. Raise an
-        exception if access should not be granted."""
-        raise NotImplementedError()
+    def _prepare_commit(self) -> typing.Any:
+        """Do whatever work the commit needs that doesn't depend on shared state, so it can be
+        done before the registry lock is acquired. The return value is passed to _do_commit()."""
+        return None
 
     @abc.abstractmethod
-    def _do_commit(self):
-        """Apply the actual change to the underlying data."""
+    def _do_commit(self, prepared: typing.Any):
+        """Apply the actual change to the underlying data. Called while holding the registry
+        lock, with the return value of _prepare_commit()."""
         raise NotImplementedError()
 
     def _begin(self):
         """Begin providing the requested access."""
-        with self._data.registry_lock:
-            if self._data.pending_deletion_map and \
-                    self._index in self._data.pending_deletion_map[type(self._index)]:
-                raise KeyError(self._index)
-            self._early_validation()
+        data = self._data
+        index = self._index
+        index_type = self._index_type
+        with data.registry_lock:
+            if data.pending_deletion_version and \
+                    index in data.pending_deletion_map.get(index_type, ()):
+                raise KeyError(index)
+            # Checked here, rather than in an overridable method, since it's the only check any
+            # subclass needs, and updates, the common case, don't need it at all.
+            if self._CHECK_IN_USE and data.is_in_use(index):
+                raise exceptions.ResourceUnavailableError(index)
             # Grab the controller data and/or transaction data and write lock them.
-            if self._data.controller_data is None:
+            controller_registry = self._controller_registry
+            if controller_registry is None:
                 controller_data = None
             else:
-                controller_data = self._data.controller_data.registry_map[type(self._index)] \
-                    .get(self._index, None)
-            transaction_data = self._data.registry_map[type(self._index)].get(self._index, None)
+                controller_data = controller_registry.get(index, None)
+            transaction_data = self._registry.get(index, None)
             if controller_data is None and transaction_data is None:
-                raise KeyError(self._index)
-            self._data.access(self._index).acquire_write()
-            # We use copy-on-write semantics for the updated element if it's a transaction. If the
-            # data is in the underlying controller and not the transaction, we need to make a copy
-            # of it in the transaction and modify that instead. In any case, we should grab and hold
-            # the controller copy's write lock to make sure nobody else tries to modify it until the
-            # transaction is terminated.
-            temporary_data = copy.copy(transaction_data or controller_data)
-        assert isinstance(temporary_data, element_data.ElementData)
+                raise KeyError(index)
+            access_manager = data.access(index)
+            # This never waits: if the element is locked elsewhere, it fails immediately with a
+            # ResourceUnavailableError, so the registry lock is never held during contention.
+            access_manager.acquire_write()
+        # We use copy-on-write semantics for the updated element if it's a transaction. If the
+        # data is in the underlying controller and not the transaction, we need to make a copy
+        # of it in the transaction and modify that instead. In any case, we should grab and hold
+        # the controller copy's write lock to make sure nobody else tries to modify it until the
+        # transaction is terminated. Registry entries are never modified in place, and now that we
+        # hold the write lock, nobody else can replace this one, so the copy can safely be made
+        # after releasing the registry lock.
+        temporary_data = (transaction_data or controller_data).copy()
         self._controller_element_data = controller_data
         self._transaction_element_data = transaction_data
         self._temporary_element_data = temporary_data
+        self._access_manager = access_manager
 
     def _commit(self):
         """Apply the changes to the data."""
         assert self._temporary_element_data is not None
-        with self._data.registry_lock:
-            access = self._data.access(self._index)
-            if self._temporary_element_data.audit:
-                self._data.audit_map[type(self._index)].append(self._index)
-            self._do_commit()
-            access.release_write()
+        data = self._data
+        prepared = self._prepare_commit()
+        with data.registry_lock:
+            self._do_commit(prepared)
+            self._access_manager.release_write()
+        if self._temporary_element_data.audit:
+            # Deques are thread-safe, so this doesn't need the registry lock. Appending after the
+            # commit also means the change is always visible by the time its audit entry is.
+            data.audit_map[self._index_type].append(self._index)
         self._controller_element_data = self._transaction_element_data = \
-            self._temporary_element_data = None
+            self._temporary_element_data = self._access_manager = None
 
     def _rollback(self):
         """Cancel the changes to the data."""
         assert self._temporary_element_data is not None
-        # Just release the write locks and discard the changes.
+        # Just release the write locks and discard the changes. Access managers have no locks of
+        # their own; their state is protected by the registry lock, so it has to be held here.
         with self._data.registry_lock:
-            self._data.access(self._index).release_write()
+            self._access_manager.release_write()
         self._controller_element_data = self._transaction_element_data = \
-            self._temporary_element_data = None
+            self._temporary_element_data = self._access_manager = None
 
     def __enter__(self) -> 'element_data.ElementData[PersistentIDType]':
         self._begin()
@@ -257,43 +451,55 @@ class WriteAccessContextBase(typing.Generic[PersistentIDType], abc.ABC):
 class Updating(WriteAccessContextBase[PersistentIDType]):
     """Context manager for gaining update (modify) access to an element in the database."""
 
-    def _early_validation(self):
-        """Perform early checks to verify that the requested access can be granted. Raise an
-        exception if access should not be granted."""
-        # Nothing needs to be checked here.
-
-    def _do_commit(self):
+    __slots__ = ()
+
+    def _prepare_commit(self) -> typing.Optional['element_data.ElementData[PersistentIDType]']:
+        """Return the new registry entry for the element, or None if it wasn't modified."""
+        # If the caller never touched the temporary copy, it is still identical to the registry
+        # entry it was copied from, so there is nothing to write.
+        temporary_data = self._temporary_element_data
+        if not temporary_data.has_modifications():
+            return None
+        # We make a copy so that if someone misbehaves and keeps a reference to the data returned
+        # by the context manager, they can't affect the registry with it. (The copy is
+        # copy-on-write, so this is cheap.) Nothing else can touch the temporary copy, so this
+        # doesn't need the registry lock.
+        return temporary_data.copy()
+
+    def _do_commit(self, prepared: typing.Optional['element_data.ElementData[PersistentIDType]']):
         """Apply the actual change to the underlying data."""
         # Doesn't matter if it's a transaction or a raw controller. In either case, we assign
-        # the new version of the element's data to the index in the registry. We make a copy first
-        # so that if someone misbehaves and keeps a reference to the data returned by the context
-        # manager, they can't affect the registry with it.
-        self._data.registry_map[type(self._index)][self._index] = \
-            copy.copy(self._temporary_element_data)
+        # the new version of the element's data to the index in the registry.
+        if prepared is not None:
+            self._registry[self._index] = prepared
 
 
 class Removing(WriteAccessContextBase[PersistentIDType]):
     """Context manager for gaining remove access to an element in the database."""
 
-    def _early_validation(self):
-        """Perform early checks to verify that the requested access can be granted. Raise an
-        exception if access should not be granted."""
-        # This can be expensive for roles and labels, because the entire database is scanned for
-        # uses. For vertices and edges, though, it's cheap.
-        if self._data.is_in_use(self._index):
-            raise exceptions.ResourceUnavailableError(self._index)
+    __slots__ = ()
+
+    # Elements can't be removed while other elements refer to them. Usage counts are maintained
+    # as elements are added and removed, so this is cheap to check.
+    _CHECK_IN_USE = True
 
-    def _do_commit(self):
+    def _do_commit(self, prepared: None):
         """Apply the actual change to the underlying data."""
         # Doesn't matter if it's a transaction or a raw controller. We make sure there is no entry
         # for the index in the registry.
-        registry = self._data.registry_map[type(self._index)]
-        if self._index in registry:
-            del registry[self._index]
-        if self._data.pending_deletion_map is None:
+        data = self._data
+        index = self._index
+        index_type = self._index_type
+        self._registry.pop(index, None)
+        data.count_usage(self._temporary_element_data, -1)
+        if data.pending_deletion_map is None:
             # For controllers only, we also remove it from the access map.
-            del self._data.access_map[type(self._index)][self._index]
+            del data.access_map[index_type][index]
         else:
             # For transactions only, we also add it to the pending deletions, to prevent
             # pass-through to the underlying controller in future operations.
-            self._data.pending_deletion_map[type(self._index)].add(self._index)
+            pending_deletions = data.pending_deletion_map.get(index_type)
+            if pending_deletions is None:
+                pending_deletions = data.pending_deletion_map[index_type] = set()
+            pending_deletions.add(index)
+            data.pending_deletion_version += 1
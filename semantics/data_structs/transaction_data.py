@@ -12,15 +12,67 @@ from semantics.data_types import data_access
 from semantics.data_types import indices
 from semantics.data_types import set_unions
 
+if typing.TYPE_CHECKING:
+    from semantics.data_structs import element_data
+
+
 PersistentIDType = typing.TypeVar('PersistentIDType', bound=indices.PersistentDataID)
 
 
+class _RegistryStackMap(dict):
+    """Maps each index type to a ChainMap of the transaction's registry over the controller's,
+    building each ChainMap the first time it's asked for. Most transactions never ask, since
+    element lookups go through look_up_data() instead, and building all of them up front was
+    the bulk of the cost of creating a transaction."""
+
+    __slots__ = ('_registry_map', '_controller_registry_map')
+
+    def __init__(self, registry_map, controller_registry_map):
+        super().__init__()
+        self._registry_map = registry_map
+        self._controller_registry_map = controller_registry_map
+
+    def __missing__(self, index_type):
+        # Raises a KeyError for anything that isn't an index type.
+        stack = collections.ChainMap(self._registry_map[index_type],
+                                     self._controller_registry_map[index_type])
+        self[index_type] = stack
+        return stack
+
+
 class TransactionData(interface.DataInterface[controller_data_module.ControllerData,
                                               data_access.TransactionThreadAccessManager]):
     """The internal data of the Transaction. Only basic data structures and accessors should appear
     in this class. Transaction behavior should be determined entirely in the Transaction class."""
 
+    # Transactions are created and discarded constantly, so they go without an instance dict.
+    __slots__ = (
+        # Set by DataInterface.__init__()
+        'access_map',
+        'audit_map',
+        'usage_counts',
+
+        'controller_data',
+        'reference_id_allocator',
+        'id_allocator_map',
+        'name_allocator_map',
+        'catalog_allocator_map',
+        'catalog_allocator_stack_map',
+        'removed_catalog_ids',
+        'held_references',
+        'held_references_union',
+        'registry_map',
+        'registry_stack_map',
+        'pending_deletion_map',
+        'pending_deletion_version',
+        'pending_name_deletion_map',
+        'pending_catalog_deletion_map',
+        'registry_lock',
+    )
+
     def __init__(self, controller_data: controller_data_module.ControllerData):
+        if controller_data.is_snapshot:
+            raise ValueError('Snapshots are read-only.')
         super().__init__()
 
         self.controller_data = controller_data
@@ -31,26 +83,14 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
         self.reference_id_allocator = controller_data.reference_id_allocator
         self.id_allocator_map = controller_data.id_allocator_map
 
-        self.name_allocator_map = {
-            index_type: allocators.MapAllocator(str, index_type)
-            for index_type in self.controller_data.name_allocator_map
-        }
-
-        self.name_allocator_stack_map = {
-            index_type: collections.ChainMap(self.name_allocator_map[index_type],
-                                             controller_name_allocator)
-            for index_type, controller_name_allocator
-            in self.controller_data.name_allocator_map.items()
-        }
-
-        self.catalog_allocator_map = {
-            index: type(allocator)(allocator.key_type, allocator.index_type)
-            for index, allocator in self.controller_data.catalog_allocator_map.items()
-        }
-        self.catalog_allocator_stack_map = {
-            index: collections.ChainMap(self.catalog_allocator_map[index], controller_allocator)
-            for index, controller_allocator in self.controller_data.catalog_allocator_map.items()
-        }
+        # The transaction's own name and catalog allocators are only created once something is
+        # allocated in them. Until then, the catalog stack map just points at the controller's
+        # allocator.
+        self.name_allocator_map = {}
+        self.catalog_allocator_map = {}
+        self.catalog_allocator_stack_map = dict(self.controller_data.catalog_allocator_map)
+        # Catalogs removed by the transaction, whose stack map entries are restored on rollback.
+        self.removed_catalog_ids: typing.Set['indices.CatalogID'] = set()
 
         self.held_references = {}
         self.held_references_union = set_unions.SetUnion(controller_data.held_references.keys(),
@@ -58,34 +98,22 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
 
         self.registry_map = {index_type: {} for index_type in self.controller_data.registry_map}
 
-        self.registry_stack_map = {
-            index_type: collections.ChainMap(self.registry_map[index_type], controller_registry)
-            for index_type, controller_registry in self.controller_data.registry_map.items()
-        }
+        self.registry_stack_map = _RegistryStackMap(self.registry_map,
+                                                    self.controller_data.registry_map)
 
-        # Objects that will be deleted on commit
-        self.pending_deletion_map = {index_type: set() for index_type in self.registry_map}
+        # Objects that will be deleted on commit, by index type. The sets are created as needed.
+        self.pending_deletion_map = {}
+        self.pending_deletion_version = 0
 
-        # Names that will be deleted on commit
-        self.pending_name_deletion_map = {index_type: set()
-                                          for index_type in self.name_allocator_map}
+        # Names that will be deleted on commit, by index type. The sets are created as needed.
+        self.pending_name_deletion_map = {}
 
-        # Catalog keys that will be deleted on commit.
-        self.pending_catalog_deletion_map: typing.Dict[indices.CatalogID,
-                                                       typing.Set[typing.Hashable]] = {}
+        # Catalog keys that will be deleted on commit, by catalog. The sets are created as needed.
+        self.pending_catalog_deletion_map = {}
 
         # Lock both the transaction and the underlying controller at once.
         self.registry_lock = controller_data.registry_lock
 
-        # Held write locks of underlying controller that needs to be released on commit/rollback
-        self.write_lock_map = {
-            indices.RoleID: set(),
-            indices.VertexID: set(),
-            indices.LabelID: set(),
-            indices.EdgeID: set(),
-            indices.CatalogID: set(),
-        }
-
     def access(self, index: 'PersistentIDType') -> 'data_access.TransactionThreadAccessManager':
         """Return the thread access manager with the given index. Raise a KeyError if
         no data is associated with the index.
@@ -93,25 +121,55 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
         Note: The registry lock must be held while calling this method.
         """
         assert self.registry_lock.locked()
-        if index in self.pending_deletion_map[type(index)]:
+        index_type = type(index)
+        if self.pending_deletion_version and \
+                index in self.pending_deletion_map.get(index_type, ()):
             raise KeyError(index)
-        if index not in self.access_map[type(index)] and \
-                index in self.controller_data.access_map[type(index)]:
-            manager = self.controller_data.access_map[type(index)][index]
-            assert isinstance(manager, data_access.ControllerThreadAccessManager)
-            manager = manager.get_transaction_level_manager()
-            self.access_map[type(index)][index] = manager
-            return manager
-        return self.access_map[type(index)][index]
+        access = self.access_map[index_type]
+        manager = access.get(index)
+        if manager is None:
+            # Raises a KeyError if the controller doesn't have it, either.
+            controller_manager = self.controller_data.access_map[index_type][index]
+            assert isinstance(controller_manager, data_access.ControllerThreadAccessManager)
+            manager = controller_manager.get_transaction_level_manager()
+            access[index] = manager
+        return manager
 
     def new_access(self, index: 'PersistentIDType') -> data_access.TransactionThreadAccessManager:
         controller_manager = data_access.ControllerThreadAccessManager(index)
         return data_access.TransactionThreadAccessManager(controller_manager)
 
+    def _get_name_allocator(self, index_type: typing.Type['PersistentIDType']) \
+            -> allocators.MapAllocator[str, 'PersistentIDType']:
+        """Return the transaction's name allocator for the index type, creating it if
+        necessary."""
+        allocator = self.name_allocator_map.get(index_type)
+        if allocator is None:
+            # Raises a KeyError if the index type doesn't have names.
+            self.controller_data.name_allocator_map[index_type]
+            allocator = allocators.MapAllocator(str, index_type)
+            self.name_allocator_map[index_type] = allocator
+        return allocator
+
+    def _get_catalog_allocator(self, catalog_id: 'indices.CatalogID') \
+            -> allocators.MapAllocator[typing.Hashable, 'indices.VertexID']:
+        """Return the transaction's allocator for the catalog, creating it if necessary."""
+        allocator = self.catalog_allocator_map.get(catalog_id)
+        if allocator is None:
+            # Raises a KeyError if the catalog doesn't exist.
+            controller_allocator = self.controller_data.catalog_allocator_map[catalog_id]
+            allocator = type(controller_allocator)(controller_allocator.key_type,
+                                                   controller_allocator.index_type)
+            self.catalog_allocator_map[catalog_id] = allocator
+            self.catalog_allocator_stack_map[catalog_id] = \
+                collections.ChainMap(allocator, controller_allocator)
+        return allocator
+
     def allocate_name(self, name: str, index: 'PersistentIDType') -> None:
         """Allocate a new name for the index."""
-        transaction_name_allocator = self.name_allocator_map[type(index)]
-        controller_name_allocator = self.controller_data.name_allocator_map[type(index)]
+        index_type = type(index)
+        transaction_name_allocator = self._get_name_allocator(index_type)
+        controller_name_allocator = self.controller_data.name_allocator_map[index_type]
         transaction_name_allocator.allocate(name, index)
         try:
             controller_name_allocator.reserve(name, self)
@@ -121,15 +179,101 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
 
     def deallocate_name(self, name: str, index: 'PersistentIDType') -> None:
         """Deallocate the name from the index."""
-        assert name not in self.pending_name_deletion_map[type(index)]
-        assert self.name_allocator_stack_map[type(index)].get(name) == index
-        self.pending_name_deletion_map[type(index)].add(name)
+        index_type = type(index)
+        pending_name_deletions = self.pending_name_deletion_map.get(index_type)
+        if pending_name_deletions is None:
+            pending_name_deletions = self.pending_name_deletion_map[index_type] = set()
+        assert name not in pending_name_deletions
+        assert self.look_up_name(index_type, name) == index
+        pending_name_deletions.add(name)
+        self.pending_deletion_version += 1
+
+    def look_up_name(self, index_type: typing.Type['PersistentIDType'],
+                     name: str) -> typing.Optional['PersistentIDType']:
+        """Return the index the name is assigned to, if any. This ignores pending name
+        deletions."""
+        # Probing the two allocators directly is much cheaper than going through a ChainMap,
+        # which raises and catches a KeyError in each allocator that doesn't have the name, and
+        # checks for it twice.
+        allocator = self.name_allocator_map.get(index_type)
+        index = None if allocator is None else allocator.get_index(name)
+        if index is None:
+            index = self.controller_data.name_allocator_map[index_type].get_index(name)
+        return index
+
+    def look_up_data(self, index: 'PersistentIDType') \
+            -> 'element_data.ElementData[PersistentIDType]':
+        """Return the registry entry for the index, without copying it. Raise a KeyError if
+        there is none. This ignores pending deletions."""
+        # As in look_up_name(), probing the two registries directly avoids the ChainMap's
+        # exception handling for every element the transaction hasn't touched.
+        index_type = type(index)
+        registry_entry = self.registry_map[index_type].get(index)
+        if registry_entry is None:
+            registry_entry = self.controller_data.registry_map[index_type][index]
+        return registry_entry
+
+    def look_up_catalog_key(self, catalog_id: 'indices.CatalogID',
+                            key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index the key is assigned to in the catalog, if any. This ignores
+        pending catalog key deletions."""
+        # ChainMap.get() checks membership in each allocator and then looks the key up again,
+        # and the allocators' membership tests go through their type-checked __getitem__.
+        allocator = self.catalog_allocator_map.get(catalog_id)
+        index = None if allocator is None else allocator.get_index(key)
+        if index is None:
+            controller_allocator = self.controller_data.catalog_allocator_map.get(catalog_id)
+            if controller_allocator is not None:
+                index = controller_allocator.get_index(key)
+        return index
+
+    def look_up_nearest_catalog_key(self, catalog_id: 'indices.CatalogID',
+                                    key: typing.Hashable) -> typing.Optional['indices.VertexID']:
+        """Return the vertex index assigned to the key in the catalog or, if there is none, to the
+        nearest key following it, or failing that, to the last key. Keys pending deletion are
+        skipped. Return None if the catalog is empty. Raise a ValueError if the catalog is
+        unordered, and a KeyError if it doesn't exist."""
+        # Raises a KeyError if the catalog doesn't exist, or has been removed by the transaction.
+        self.catalog_allocator_stack_map[catalog_id]
+        ordered_allocators = [
+            allocator
+            for allocator in (self.catalog_allocator_map.get(catalog_id),
+                              self.controller_data.catalog_allocator_map.get(catalog_id))
+            if allocator is not None
+        ]
+        # The transaction's allocator, if any, is always of the same type as the controller's.
+        if not isinstance(ordered_allocators[0], allocators.OrderedMapAllocator):
+            raise ValueError('Unordered catalog does not support `nearest` flag.')
+        deletions = ()
+        if self.pending_deletion_version:
+            deletions = self.pending_catalog_deletion_map.get(catalog_id, ())
+        # The nearest key is the least key at or after the one requested in either allocator, or
+        # if there is no such key, the greatest key in either.
+        following = []
+        for allocator in ordered_allocators:
+            for found_key in allocator.iter_keys(key):
+                if found_key not in deletions:
+                    following.append(found_key)
+                    break
+        if following:
+            return self.look_up_catalog_key(catalog_id, min(following))
+        preceding = []
+        for allocator in ordered_allocators:
+            for found_key in allocator.iter_keys(reverse=True):
+                if found_key not in deletions:
+                    preceding.append(found_key)
+                    break
+        if preceding:
+            return self.look_up_catalog_key(catalog_id, max(preceding))
+        return None
 
     def allocate_catalog_key(self, catalog_id: 'indices.CatalogID', key: typing.Hashable,
                              index: 'indices.VertexID') -> None:
         assert self.registry_lock.locked()
-        with self.access(catalog_id).read_lock:
-            transaction_allocator = self.catalog_allocator_map[catalog_id]
+        access_manager = self.access(catalog_id)
+        access_manager.acquire_read()
+        try:
+            transaction_allocator = self._get_catalog_allocator(catalog_id)
             controller_allocator = self.controller_data.catalog_allocator_map.get(catalog_id, None)
             transaction_allocator.allocate(key, index)
             if controller_allocator is not None:
@@ -138,17 +282,27 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
                 except KeyError:
                     transaction_allocator.deallocate(key)
                     raise
+        finally:
+            access_manager.release_read()
 
     def deallocate_catalog_key(self, catalog_id: 'indices.CatalogID', key: typing.Hashable) -> None:
         assert self.registry_lock.locked()
-        with self.access(catalog_id).read_lock:
-            assert key not in self.pending_catalog_deletion_map[catalog_id]
-            assert key in self.catalog_allocator_map[catalog_id]
-            self.pending_catalog_deletion_map[catalog_id].add(key)
+        access_manager = self.access(catalog_id)
+        access_manager.acquire_read()
+        try:
+            pending_catalog_deletions = self.pending_catalog_deletion_map.get(catalog_id)
+            if pending_catalog_deletions is None:
+                pending_catalog_deletions = self.pending_catalog_deletion_map[catalog_id] = set()
+            assert key not in pending_catalog_deletions
+            assert self.look_up_catalog_key(catalog_id, key) is not None
+            pending_catalog_deletions.add(key)
+            self.pending_deletion_version += 1
+        finally:
+            access_manager.release_read()
 
     def add_catalog(self, catalog_id: 'indices.CatalogID', allocator: ...) -> None:
         assert self.registry_lock.locked()
-        assert catalog_id not in self.catalog_allocator_map
+        assert catalog_id not in self.catalog_allocator_stack_map
         self.catalog_allocator_map[catalog_id] = allocator
         controller_allocator = self.controller_data.catalog_allocator_map.get(catalog_id, None)
         if controller_allocator is None:
@@ -156,3 +310,10 @@ class TransactionData(interface.DataInterface[controller_data_module.ControllerD
         else:
             self.catalog_allocator_stack_map[catalog_id] = \
                 collections.ChainMap(allocator, controller_allocator)
+
+    def remove_catalog(self, catalog_id: 'indices.CatalogID') -> None:
+        assert self.registry_lock.locked()
+        # The controller's allocator is removed when the catalog's removal is committed.
+        self.catalog_allocator_map.pop(catalog_id, None)
+        del self.catalog_allocator_stack_map[catalog_id]
+        self.removed_catalog_ids.add(catalog_id)
@@ -1,10 +1,11 @@
 """
 Allocators for various simple resources, e.g., unique indices and name/index assignments.
 """
-import bisect
 import threading
 import typing
 
+import sortedcontainers
+
 KeyType = typing.TypeVar('KeyType', bound=typing.Hashable)
 IndexType = typing.TypeVar('IndexType', bound=int)
 
@@ -51,6 +52,10 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
         self._key_map: typing.Dict[KeyType, IndexType] = {}
         self._index_map: typing.Dict[IndexType, KeyType] = {}
         self._reserved: typing.Dict[KeyType, typing.Any] = {}
+        # The keys reserved by each owner, by the owner's id, so an owner's reservations can all
+        # be canceled without scanning everyone else's. An owner is kept alive by its entries in
+        # _reserved, so its id can't be reused while it is listed here.
+        self._reserved_by_owner: typing.Dict[int, typing.Set[KeyType]] = {}
         self._lock = threading.Lock()
 
     def __getstate__(self):
@@ -60,8 +65,23 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
         self._key_type, self._index_type, self._key_map = state
         self._index_map = {index: key for key, index in self._key_map.items()}
         self._reserved = {}
+        self._reserved_by_owner = {}
         self._lock = threading.Lock()
 
+    def copy(self) -> 'MapAllocator[KeyType, IndexType]':
+        """Return a new allocator with the same key/index assignments. Reservations are not
+        copied."""
+        duplicate = type(self)(self._key_type, self._index_type)
+        with self._lock:
+            self._copy_to(duplicate)
+        return duplicate
+
+    def _copy_to(self, duplicate: 'MapAllocator[KeyType, IndexType]') -> None:
+        """Copy the key/index assignments to a new, empty allocator. Called while holding the
+        lock."""
+        duplicate._key_map = self._key_map.copy()
+        duplicate._index_map = self._index_map.copy()
+
     @property
     def key_type(self) -> typing.Type[KeyType]:
         """The type of key the allocator maps to indices."""
@@ -87,10 +107,12 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
 
     def __getitem__(self, value: typing.Union[KeyType, IndexType]) \
             -> typing.Union[KeyType, IndexType]:
+        # The maps are probed directly rather than through get_index() and get_key(), whose
+        # type checks would only repeat the ones made here.
         if isinstance(value, self._key_type):
-            result = self.get_index(value)
+            result = self._key_map.get(value, None)
         elif isinstance(value, self._index_type):
-            result = self.get_key(value)
+            result = self._index_map.get(value, None)
         else:
             raise TypeError(value, (self._key_type, self._index_type))
         if result is None:
@@ -105,8 +127,9 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
 
     def is_reserved(self, key: KeyType) -> bool:
         """Return whether the key is currently reserved."""
-        with self._lock:
-            return key in self._reserved
+        # Like get_index() and get_key(), this is a single dict lookup, which the GIL already
+        # makes atomic. The lock is only needed where a check and a change must happen together.
+        return key in self._reserved
 
     def reserve(self, key: KeyType, owner: typing.Any) -> None:
         """Prevent a key from being mapped to an index, except by the given owner."""
@@ -116,6 +139,11 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
             if key in self._key_map:
                 raise KeyError("Key %r is already allocated." % (key,))
             self._reserved[key] = owner
+            keys = self._reserved_by_owner.get(id(owner), None)
+            if keys is None:
+                self._reserved_by_owner[id(owner)] = {key}
+            else:
+                keys.add(key)
 
     def cancel_reservation(self, key: KeyType, owner: typing.Any) -> None:
         """Cancel a previously made key reservation by the given owner."""
@@ -123,17 +151,25 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
             if self._reserved.get(key, None) is not owner:
                 raise KeyError("Key %r is not reserved by this owner." % (key,))
             del self._reserved[key]
+            self._unlist_reservation(key, owner)
 
     def cancel_all_reservations(self, owner: typing.Any) -> None:
         """Cancel all previously made key reservations by the given owner."""
+        # The owner is the only one who adds its reservations, so if it has none, there is
+        # nothing of the owner's that could appear while we look.
+        if id(owner) not in self._reserved_by_owner:
+            return
         with self._lock:
-            keys = []
-            for key, reservation_owner in self._reserved.items():
-                if reservation_owner is owner:
-                    keys.append(key)
-            for key in keys:
+            for key in self._reserved_by_owner.pop(id(owner), ()):
                 del self._reserved[key]
 
+    def _unlist_reservation(self, key: KeyType, owner: typing.Any) -> None:
+        """Remove a key from the owner's listed reservations. The lock must be held."""
+        keys = self._reserved_by_owner[id(owner)]
+        keys.discard(key)
+        if not keys:
+            del self._reserved_by_owner[id(owner)]
+
     def allocate(self, key: KeyType, index: IndexType, owner: typing.Any = None):
         """Map the given key to the given index. If the key is reserved by a different owner, or
         is reserved by any owner and no owner is provided, raise an exception. If the key is already
@@ -147,7 +183,9 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
             if self._index_map.get(index, key) != key:
                 raise KeyError("Index %r is already mapped." % (index,))
             if key in self._reserved:
-                del self._reserved[key]
+                self._unlist_reservation(key, self._reserved.pop(key))
+            if key not in self._key_map:
+                self._keys_added((key,))
             self._key_map[key] = index
             self._index_map[index] = key
 
@@ -158,6 +196,7 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
                 raise KeyError("Key %r is not allocated." % (key,))
             index = self._key_map.pop(key)
             del self._index_map[index]
+            self._key_removed(key)
         return index
 
     def get_index(self, key: KeyType) -> typing.Optional[IndexType]:
@@ -189,16 +228,32 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
                 new_index = other._key_map.get(key, None)
                 if old_index is not None and old_index != new_index:
                     raise KeyError("Key %r is already reserved for %s." % (key, old_index))
-            updated_keys = self._key_map.copy()
-            updated_keys.update(other._key_map)
-            updated_indices = self._index_map.copy()
-            updated_indices.update(other._index_map)
-            if len(updated_keys) < len(updated_indices):
+            # This is called on every commit to merge a transaction's handful of new entries into
+            # the controller's allocator, so the sizes of the merged mappings are worked out from
+            # the new entries alone, rather than by merging copies of the whole thing. (Keys view
+            # set operations would iterate over the larger mapping, so they are avoided, too.)
+            key_map = self._key_map
+            index_map = self._index_map
+            new_keys = [key for key in other._key_map if key not in key_map]
+            updated_key_count = len(key_map) + len(new_keys)
+            updated_index_count = len(index_map) + sum(index not in index_map
+                                                       for index in other._index_map)
+            if updated_key_count < updated_index_count:
                 raise KeyError("Two or more indices would be assigned to the same key.")
-            if len(updated_keys) > len(updated_indices):
+            if updated_key_count > updated_index_count:
                 raise KeyError("Two or more keys would be assigned to the same index.")
-            self._key_map = updated_keys
-            self._index_map = updated_indices
+            key_map.update(other._key_map)
+            index_map.update(other._index_map)
+            if new_keys:
+                self._keys_added(new_keys)
+
+    def _keys_added(self, keys: typing.Collection[KeyType]) -> None:
+        """Called by allocate() and update() with the keys that weren't mapped before, while
+        the lock is still held."""
+
+    def _key_removed(self, key: KeyType) -> None:
+        """Called by deallocate() with the key that was unmapped, while the lock is still
+        held."""
 
     def clear(self):
         """Remove all key/index mappings and key reservations, returning the allocator to its
@@ -207,6 +262,7 @@ class MapAllocator(typing.MutableMapping[KeyType, IndexType]):
             self._key_map.clear()
             self._index_map.clear()
             self._reserved.clear()
+            self._reserved_by_owner.clear()
 
 
 class OrderedMapAllocator(MapAllocator[KeyType, IndexType]):
@@ -214,90 +270,47 @@ class OrderedMapAllocator(MapAllocator[KeyType, IndexType]):
 
     def __init__(self, key_type: typing.Type[KeyType], index_type: typing.Type[IndexType]):
         super().__init__(key_type, index_type)
-        self._sorted_keys = []
+        # A plain list kept in order with bisect.insort() has to shift everything after each new
+        # key, which makes filling a large catalog quadratic. A SortedList inserts in log time.
+        self._sorted_keys = sortedcontainers.SortedList()
 
     def __setstate__(self, state):
         super().__setstate__(state)
-        self._sorted_keys = sorted(self._key_map)
+        self._sorted_keys = sortedcontainers.SortedList(self._key_map)
 
     def __iter__(self) -> typing.Iterator[KeyType]:
         return iter(self._sorted_keys)
 
+    def _keys_added(self, keys: typing.Collection[KeyType]) -> None:
+        self._sorted_keys.update(keys)
+
+    def _key_removed(self, key: KeyType) -> None:
+        self._sorted_keys.remove(key)
+
+    def _copy_to(self, duplicate: 'OrderedMapAllocator[KeyType, IndexType]') -> None:
+        super()._copy_to(duplicate)
+        # The keys are already in order, so this is a linear copy rather than a sort.
+        duplicate._sorted_keys = self._sorted_keys.copy()
+
+    def iter_keys(self, minimum: KeyType = None, *,
+                  reverse: bool = False) -> typing.Iterator[KeyType]:
+        """Iterate over the keys in sorted order, starting from the given minimum (inclusive) if
+        one is provided, or in reverse order, ending at it, if reverse is set."""
+        return self._sorted_keys.irange(minimum=minimum, reverse=reverse)
+
     def get(self, key: KeyType, default: IndexType = None, *,
             nearest: bool = False) -> typing.Optional[IndexType]:
         exact = super().get(key)
         if exact is not None:
             return exact
         if nearest:
-            sequence_index = bisect.bisect_left(self._sorted_keys, key)
+            sequence_index = self._sorted_keys.bisect_left(key)
             if sequence_index < len(self._sorted_keys):
-                return self[self._sorted_keys[sequence_index]]
+                return self._key_map[self._sorted_keys[sequence_index]]
             if self._sorted_keys and sequence_index == len(self._sorted_keys):
-                return self[self._sorted_keys[-1]]
+                return self._key_map[self._sorted_keys[-1]]
         return default
 
-    def allocate(self, key: KeyType, index: IndexType, owner: typing.Any = None):
-        """Map the given key to the given index. If the key is reserved by a different owner, or
-        is reserved by any owner and no owner is provided, raise an exception. If the key is already
-        mapped to another index, or another key already maps to the index, raise an exception."""
-        super().allocate(key, index, owner)
-
-        assert index is not None
-        with self._lock:
-            if self._reserved.get(key, owner) is not owner:
-                raise KeyError("Key %r is already reserved." % (key,))
-            if self._key_map.get(key, index) != index:
-                raise KeyError("Key %r is already allocated." % (key,))
-            if self._index_map.get(index, key) != key:
-                raise KeyError("Index %r is already mapped." % (index,))
-            if key in self._reserved:
-                del self._reserved[key]
-            self._key_map[key] = index
-            self._index_map[index] = key
-            bisect.insort(self._sorted_keys, key)
-
-    def deallocate(self, key: KeyType) -> IndexType:
-        """Remove and return the mapped index for the given key."""
-        with self._lock:
-            if key not in self._key_map:
-                raise KeyError("Key %r is not allocated." % (key,))
-            index = self._key_map.pop(key)
-            del self._index_map[index]
-            sequence_index = bisect.bisect_left(self._sorted_keys, key)
-            assert self._sorted_keys[sequence_index] == key
-            del self._sorted_keys[sequence_index]
-        return index
-
-    # Pylint doesn't understand that other has the same type as self, and no amount of type
-    # annotations or assertions seems to change that.
-    # pylint: disable=W0212
-    def update(self, other: 'MapAllocator', owner: typing.Any = None) -> None:
-        """Update the mapping to incorporate the contents of another mapping. Similar in effect to
-        dict.update(), except that reservations and mapping conflicts are accounted for."""
-        assert self._key_type is other._key_type
-        assert self._index_type is other._index_type
-        if other is self:
-            return
-        with self._lock:
-            for key, reservation_owner in self._reserved.items():
-                if reservation_owner is owner:
-                    continue
-                old_index = self._key_map.get(key, None)
-                new_index = other._key_map.get(key, None)
-                if old_index is not None and old_index != new_index:
-                    raise KeyError("Key %r is already reserved for %s." % (key, old_index))
-            updated_keys = self._key_map.copy()
-            updated_keys.update(other._key_map)
-            updated_indices = self._index_map.copy()
-            updated_indices.update(other._index_map)
-            if len(updated_keys) < len(updated_indices):
-                raise KeyError("Two or more indices would be assigned to the same key.")
-            if len(updated_keys) > len(updated_indices):
-                raise KeyError("Two or more keys would be assigned to the same index.")
-            self._key_map = updated_keys
-            self._index_map = updated_indices
-            self._sorted_keys = sorted(self._key_map)
-
     def clear(self):
         """Remove all key/index mappings and key reservations, returning the allocator to its
         initial state."""
@@ -305,4 +318,5 @@ class OrderedMapAllocator(MapAllocator[KeyType, IndexType]):
             self._key_map.clear()
             self._index_map.clear()
             self._reserved.clear()
+            self._reserved_by_owner.clear()
             self._sorted_keys.clear()
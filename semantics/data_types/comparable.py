@@ -12,6 +12,8 @@ class Comparable(typing.Protocol):
     """Abstract protocol for types that can be compared to themselves with the less-than
     operator, i.e., types that can be sorted. This is only used for type annotations."""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def __lt__(self: 'ComparableType', other: 'ComparableType') -> bool:
         pass
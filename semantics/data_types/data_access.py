@@ -13,6 +13,8 @@ if typing.TYPE_CHECKING:
 class AccessLock:
     """A context manager for acquiring and releasing a lock."""
 
+    __slots__ = ('enter', 'leave')
+
     def __init__(self, enter, leave):
         self.enter = enter
         self.leave = leave
@@ -28,6 +30,8 @@ class AccessLock:
 class ThreadAccessManagerInterface(abc.ABC):
     """Interface for managers for read and write access to a data element."""
 
+    __slots__ = ()
+
     @property
     def read_lock(self) -> AccessLock:
         """A context manager for automatically acquiring and releasing the element's read lock.
@@ -91,10 +95,35 @@ class ThreadAccessManagerInterface(abc.ABC):
 class ControllerThreadAccessManager(ThreadAccessManagerInterface):
     """Manager for read and write access to a data element in a controller."""
 
+    # There is one of these for every element in the controller, so they are kept as small as
+    # possible: no instance dict, and no read lock dict unless the element is actually read locked
+    # by more than one thread at once.
+    __slots__ = ('_index', '_read_locked_by', '_read_count', '_write_locked_by')
+
     def __init__(self, index: 'indices.PersistentDataID'):
         self._index = index
-        self._read_locked_by: typing.Dict[threading.Thread, int] = {}
-        self._write_locked_by: typing.Optional[threading.Thread] = None
+        # Locks are tracked by thread identifier rather than thread object, since
+        # `threading.get_ident()` is much cheaper than `threading.current_thread()`. (Identifiers
+        # can be reused once a thread exits, but locks are never held past the end of the
+        # operation or transaction that took them, so a thread can't leave one behind.) Nearly
+        # always, only one thread holds read locks on an element at a time, so that thread's
+        # identifier is stored directly, with the number of read locks it holds in _read_count.
+        # Only when a second thread acquires a read lock do they switch over to a dict mapping
+        # each thread identifier to its count.
+        self._read_locked_by: typing.Union[None, int, typing.Dict[int, int]] = None
+        self._read_count = 0
+        self._write_locked_by: typing.Optional[int] = None
+
+    def __getstate__(self):
+        return {'_index': self._index}
+
+    def __setstate__(self, state):
+        # Older saves pickled the instance dict, including the lock state, which is simply
+        # discarded.
+        self._index = state['_index']
+        self._read_locked_by = None
+        self._read_count = 0
+        self._write_locked_by = None
 
     @property
     def index(self) -> 'indices.PersistentDataID':
@@ -103,16 +132,25 @@ class ControllerThreadAccessManager(ThreadAccessManagerInterface):
     @property
     def is_read_locked(self) -> bool:
         """Whether the data element is currently locked for read access by any thread."""
-        return bool(self._read_locked_by)
+        return self._read_locked_by is not None
 
     @property
     def is_write_locked(self) -> bool:
         """Whether the data element is currently locked for write access by any thread."""
         return self._write_locked_by is not None
 
+    def _is_read_locked_by_other_threads(self, thread_id: int) -> bool:
+        """Whether any thread other than the given one holds a read lock on the element."""
+        read_locked_by = self._read_locked_by
+        if read_locked_by is None or read_locked_by == thread_id:
+            return False
+        if isinstance(read_locked_by, dict):
+            return len(read_locked_by) > 1 or thread_id not in read_locked_by
+        return True
+
     @property
-    def write_locked_by(self) -> typing.Optional[threading.Thread]:
-        """The thread that owns the currently held write lock, if any."""
+    def write_locked_by(self) -> typing.Optional[int]:
+        """The identifier of the thread that owns the currently held write lock, if any."""
         return self._write_locked_by
 
     def get_transaction_level_manager(self) -> 'TransactionThreadAccessManager':
@@ -123,43 +161,63 @@ class ControllerThreadAccessManager(ThreadAccessManagerInterface):
         """Acquire a read lock on the element for the current thread."""
         # This is guaranteed to only be called while the registry lock is held, so there won't be
         # any race conditions.
-        if self._write_locked_by:
+        if self._write_locked_by is not None:
             raise exceptions.ResourceUnavailableError(self.index)
-        thread = threading.current_thread()
-        self._read_locked_by[thread] = self._read_locked_by.get(thread, 0) + 1
+        thread_id = threading.get_ident()
+        read_locked_by = self._read_locked_by
+        if read_locked_by is None:
+            self._read_locked_by = thread_id
+            self._read_count = 1
+        elif read_locked_by == thread_id:
+            self._read_count += 1
+        elif isinstance(read_locked_by, dict):
+            read_locked_by[thread_id] = read_locked_by.get(thread_id, 0) + 1
+        else:
+            # A second thread is reading the element.
+            self._read_locked_by = {read_locked_by: self._read_count, thread_id: 1}
 
     def release_read(self):
         """Release a read lock on the element for the current thread."""
         # This is guaranteed to only be called while the registry lock is held, so there won't be
         # any race conditions.
-        thread = threading.current_thread()
-        reads_held = self._read_locked_by.get(thread, 0)
+        thread_id = threading.get_ident()
+        read_locked_by = self._read_locked_by
+        assert read_locked_by is not None
+        if read_locked_by == thread_id:
+            assert self._read_count > 0
+            if self._read_count > 1:
+                self._read_count -= 1
+            else:
+                self._read_locked_by = None
+            return
+        assert isinstance(read_locked_by, dict)
+        reads_held = read_locked_by.get(thread_id, 0)
         assert reads_held > 0
         if reads_held > 1:
-            self._read_locked_by[thread] = reads_held - 1
+            read_locked_by[thread_id] = reads_held - 1
+        elif len(read_locked_by) > 1:
+            del read_locked_by[thread_id]
         else:
-            del self._read_locked_by[thread]
+            self._read_locked_by = None
 
     def acquire_write(self):
         """Acquire a write lock on the element for the current thread."""
         # This is guaranteed to only be called while the registry lock is held, so there won't be
         # any race conditions.
-        thread = threading.current_thread()
-        if self._read_locked_by and (len(self._read_locked_by) > 1 or
-                                     thread not in self._read_locked_by):
+        thread_id = threading.get_ident()
+        if self._is_read_locked_by_other_threads(thread_id):
             raise exceptions.ResourceUnavailableError(self.index)
-        if self._write_locked_by:
+        if self._write_locked_by is not None:
             raise exceptions.ResourceUnavailableError(self.index)
-        self._write_locked_by = thread
+        self._write_locked_by = thread_id
 
     def release_write(self):
         """Release a write lock on the element for the current thread."""
         # This is guaranteed to only be called while the registry lock is held, so there won't be
         # any race conditions.
-        thread = threading.current_thread()
-        assert not self._read_locked_by or (len(self._read_locked_by) == 1 and
-                                            thread in self._read_locked_by)
-        assert self._write_locked_by is thread
+        thread_id = threading.get_ident()
+        assert not self._is_read_locked_by_other_threads(thread_id)
+        assert self._write_locked_by == thread_id
         self._write_locked_by = None
 
 
@@ -171,16 +229,19 @@ class TransactionThreadAccessManager(ThreadAccessManagerInterface):
     controller is continuously held.
     """
 
+    __slots__ = ('_controller_manager', '_thread_id', '_read_locked', '_write_locked',
+                 '_controller_read_lock_held', '_controller_write_lock_held')
+
     def __init__(self, controller_manager: ControllerThreadAccessManager):
         self._controller_manager = controller_manager
-        self._thread = threading.current_thread()
+        self._thread_id = threading.get_ident()
         self._read_locked = 0
         self._write_locked = False
         self._controller_read_lock_held = False
         self._controller_write_lock_held = False
 
     def _validate(self) -> None:
-        if threading.current_thread() is not self._thread:
+        if threading.get_ident() != self._thread_id:
             raise exceptions.InvalidThreadError()
 
     @property
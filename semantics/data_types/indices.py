@@ -8,49 +8,70 @@ Integer index types that only compare as equal to other indices of the same type
 class UniqueID(int):
     """Base class for all unique index types."""
 
+    # Indices are used as keys everywhere, so they carry no instance dict. Every subclass must
+    # declare empty slots, too, or it gets one anyway.
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return '%s(%s)' % (type(self).__name__, int(self))
 
-    # Pylint warns about the useless call to super(), but it actually causes a TypeError if
-    # we take this method definition out and we try to use a UniqueID as a dictionary key.
-    # pylint: disable=W0235
-    def __hash__(self):
-        return super().__hash__()
+    # Defining __eq__ would otherwise make the class unhashable. Reusing int's hash directly,
+    # rather than wrapping it in a method that calls super(), keeps hashing at C level for every
+    # dictionary lookup.
+    __hash__ = int.__hash__
+
+    # Comparisons check for an exact type match before falling back on isinstance(), since that
+    # is by far the most common case, and call int's methods directly, since super() would build
+    # a proxy object on every comparison.
 
     def __eq__(self, other):
-        if not isinstance(other, type(self)):
+        if type(other) is not type(self) and not isinstance(other, type(self)):
             return False
-        return super().__eq__(other)
+        return int.__eq__(self, other)
 
     def __ne__(self, other):
-        if not isinstance(other, type(self)):
+        if type(other) is not type(self) and not isinstance(other, type(self)):
             return True
-        return super().__ne__(other)
+        return int.__ne__(self, other)
 
 
 class ReferenceID(UniqueID):
     """Unique ID for temporary references to persistent resources."""
 
+    __slots__ = ()
+
 
 class PersistentDataID(UniqueID):
     """Base class for index types that correspond directly to persistent data resources."""
 
+    __slots__ = ()
+
 
 class RoleID(PersistentDataID):
     """Unique ID for roles."""
 
+    __slots__ = ()
+
 
 class VertexID(PersistentDataID):
     """Unique ID for vertices."""
 
+    __slots__ = ()
+
 
 class LabelID(PersistentDataID):
     """Unique ID for labels."""
 
+    __slots__ = ()
+
 
 class EdgeID(PersistentDataID):
     """Unique ID for edges."""
 
+    __slots__ = ()
+
 
 class CatalogID(PersistentDataID):
     """Unique ID for catalogs."""
+
+    __slots__ = ()
@@ -1,3 +1,4 @@
+import functools
 import logging
 import typing
 
@@ -6,17 +7,36 @@ import iso639
 _logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _to_iso639_2t(code: str) -> typing.Optional[str]:
+    """Return the ISO639-2/T code for the given language code, or None if the code is not
+    recognized. The iso639 lookup is slow, and the same few codes come up over and over, e.g.,
+    every time a saved language ID is loaded, so the results are cached."""
+    try:
+        return iso639.to_iso639_2(code, 'T')
+    except iso639.NonExistentLanguageError:
+        return None
+
+
+# Likewise for the lookups behind LanguageID's properties. These are only ever made for valid
+# codes, so they don't raise.
+_to_native = functools.lru_cache(maxsize=1024)(iso639.to_native)
+_to_name = functools.lru_cache(maxsize=1024)(iso639.to_name)
+_to_iso639_2 = functools.lru_cache(maxsize=1024)(iso639.to_iso639_2)
+_to_iso639_1 = functools.lru_cache(maxsize=1024)(iso639.to_iso639_1)
+
+
 class LanguageID:
     """Unique language identifier"""
 
+    __slots__ = ('_code', '_valid')
+
     def __init__(self, code: str):
-        try:
-            valid_code = iso639.to_iso639_2(code, 'T')
-            if valid_code != code:
-                _logger.info("Mapped language %s to ISO639-2/T code %s.", code, valid_code)
-        except iso639.NonExistentLanguageError:
-            valid_code = None
+        valid_code = _to_iso639_2t(code)
+        if valid_code is None:
             _logger.warning("Unrecognized language: %s", code)
+        elif valid_code != code:
+            _logger.info("Mapped language %s to ISO639-2/T code %s.", code, valid_code)
         self._code = valid_code or code
         self._valid = valid_code is not None
 
@@ -54,7 +74,7 @@ class LanguageID:
     def autonym(self) -> typing.Optional[str]:
         """The name of this language, as expressed in this language."""
         if self._valid:
-            return iso639.to_native(self)
+            return _to_native(self._code)
         else:
             return None
 
@@ -62,7 +82,7 @@ class LanguageID:
     def english_name(self) -> typing.Optional[str]:
         """The English name of this language."""
         if self._valid:
-            return iso639.to_name(self)
+            return _to_name(self._code)
         else:
             return None
 
@@ -70,7 +90,7 @@ class LanguageID:
     def iso639_2b(self) -> typing.Optional[str]:
         """The 3 letter ISO639-2/B code for this language."""
         if self._valid:
-            return iso639.to_iso639_2(self, 'B')
+            return _to_iso639_2(self._code, 'B')
         else:
             return None
 
@@ -86,6 +106,6 @@ class LanguageID:
     def iso639_1(self) -> typing.Optional[str]:
         """The 2 letter ISO629-1 code for this language."""
         if self._valid:
-            return iso639.to_iso639_1(self)
+            return _to_iso639_1(self._code)
         else:
             return None
@@ -27,10 +27,32 @@ class SetUnion(typing.AbstractSet[ValueType]):
         self._subsets = subsets
 
     def __contains__(self, value: object) -> bool:
-        return any(value in subset for subset in self._subsets)
+        # A plain loop, rather than any() over a generator expression, since membership is
+        # mostly tested for values that aren't there, and building and driving the generator
+        # costs several times as much as the subset lookups themselves.
+        for subset in self._subsets:
+            if value in subset:
+                return True
+        return False
 
     def __len__(self) -> int:
-        return len(set.union(*self._subsets))
+        if len(self._subsets) == 1:
+            return len(self._subsets[0])
+        # set().union() rather than set.union(), since the subsets needn't be sets themselves,
+        # e.g., dict key views.
+        return len(set().union(*self._subsets))
 
     def __iter__(self) -> typing.Iterator[ValueType]:
-        return iter(set.union(*self._subsets))
+        # Values are yielded lazily, straight from the subsets, rather than by building their
+        # union up front. A value is skipped if an earlier subset already yielded it, so there is
+        # no need to keep track of what has been seen. As with iterating over a set, the subsets
+        # must not be modified during iteration.
+        subsets = self._subsets
+        for index, subset in enumerate(subsets):
+            earlier = subsets[:index]
+            for value in subset:
+                for earlier_subset in earlier:
+                    if value in earlier_subset:
+                        break
+                else:
+                    yield value
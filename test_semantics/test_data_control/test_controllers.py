@@ -236,6 +236,24 @@ class TestControllerSaveAndLoad(TestCase):
             self.assertNotEqual(label1_id, label2_id)
 
 
+class TestControllerSnapshot(TestCase):
+
+    def test_snapshot(self):
+        controller = Controller()
+        role_id = controller.add_role('role')
+        vertex_id = controller.add_vertex(role_id)
+        snapshot = controller.snapshot()
+        controller.set_data_key(vertex_id, 'key', 'value')
+        label_id = controller.add_label('label')
+        self.assertEqual(snapshot.get_role_name(role_id), 'role')
+        self.assertEqual(snapshot.get_vertex_preferred_role(vertex_id), role_id)
+        self.assertIsNone(snapshot.get_data_key(vertex_id, 'key'))
+        self.assertIsNone(snapshot.find_label('label'))
+        self.assertEqual(controller.get_label_name(label_id), 'label')
+        with self.assertRaises(ValueError):
+            snapshot.add_role('another role')
+
+
 class TestControllerReferences(base.BaseControllerReferencesTestCase):
     base_controller_subclass = Controller
 
@@ -2,7 +2,7 @@ from typing import Callable
 
 from semantics.data_control.transactions import Transaction
 from semantics.data_types.exceptions import ResourceUnavailableError
-from semantics.data_types.indices import PersistentDataID
+from semantics.data_types.indices import PersistentDataID, RoleID
 from test_semantics.test_data_control import base
 
 
@@ -135,6 +135,11 @@ class TestTransactionCommit(base.BaseControllerTestCase):
         self.transaction.commit()
         self.transaction.release_reference(reference_id, vertex_id)
 
+    def test_name_reservations_released(self):
+        self.transaction.add_role('test')
+        self.transaction.commit()
+        self.assertFalse(self.data.name_allocator_map[RoleID].is_reserved('test'))
+
 
 class TestTransactionRollback(base.BaseControllerTestCase):
     """
@@ -173,6 +178,14 @@ class TestTransactionRollback(base.BaseControllerTestCase):
     def test_add_role(self):
         self.do_add_test(self.transaction.add_role('test'))
 
+    def test_name_reservations_released(self):
+        self.transaction.add_role('test')
+        self.transaction.rollback()
+        # The name is free to be used again, whether by the controller or the transaction.
+        self.controller.add_role('test')
+        self.controller.remove_role(self.controller.find_role('test'))
+        self.transaction.add_role('test')
+
     def test_add_vertex(self):
         self.do_add_test(self.transaction.add_vertex(self.preexisting_role_id))
 
@@ -254,6 +267,24 @@ class TestTransactionRollback(base.BaseControllerTestCase):
         )
         self.do_remove_test(index, self.transaction.remove_edge)
 
+    def test_remove_catalog(self):
+        catalog_id = self.controller.add_catalog('test', str, ordered=True)
+        self.controller.add_catalog_entry(catalog_id, 'key', self.preexisting_source_id)
+        # The transaction only sees catalogs that existed when it was opened.
+        self.transaction = Transaction(self.controller)
+        self.transaction.add_catalog_entry(catalog_id, 'other key', self.preexisting_sink_id)
+        self.transaction.remove_catalog(catalog_id)
+        self.transaction.rollback()
+        # After the rollback, the catalog and its entries are intact in both.
+        for controller_interface in (self.controller, self.transaction):
+            self.assertEqual(controller_interface.get_catalog_size(catalog_id), 1)
+            self.assertEqual(controller_interface.find_in_catalog(catalog_id, 'key'),
+                             self.preexisting_source_id)
+            self.assertEqual(controller_interface.find_in_catalog(catalog_id, 'k', nearest=True),
+                             self.preexisting_source_id)
+        # And the transaction's key reservations are released.
+        self.controller.add_catalog_entry(catalog_id, 'other key', self.preexisting_sink_id)
+
 
 class TestTransactionReferences(base.BaseControllerReferencesTestCase):
     base_controller_subclass = Transaction
@@ -330,6 +361,37 @@ class TestTransactionVertices(base.BaseControllerVerticesTestCase):
     def test_find_in_catalog(self):
         super().test_find_in_catalog()
 
+    def test_find_nearest_in_catalog_after_write(self):
+        """
+        Verify:
+            * Nearest lookups see entries from both the controller and the transaction, both
+              before and after the transaction writes to the catalog.
+            * Entries removed in the transaction are skipped.
+        """
+        role_id = self.controller.add_role('test_role')
+        vertex_b = self.controller.add_vertex(role_id)
+        vertex_d = self.controller.add_vertex(role_id)
+        catalog_id = self.controller.add_catalog('test_catalog', str, ordered=True)
+        self.controller.add_catalog_entry(catalog_id, 'b', vertex_b)
+        self.controller.add_catalog_entry(catalog_id, 'd', vertex_d)
+        # The transaction only sees catalogs that existed when it was opened.
+        self.transaction = Transaction(self.controller)
+        self.assertEqual(vertex_d, self.transaction.find_in_catalog(catalog_id, 'c', nearest=True))
+        # Writing to the catalog gives the transaction its own allocator for it.
+        vertex_c = self.transaction.add_vertex(role_id)
+        self.transaction.add_catalog_entry(catalog_id, 'c', vertex_c)
+        self.assertEqual(vertex_b, self.transaction.find_in_catalog(catalog_id, 'a', nearest=True))
+        self.assertEqual(vertex_c, self.transaction.find_in_catalog(catalog_id, 'c', nearest=True))
+        self.assertEqual(vertex_c, self.transaction.find_in_catalog(catalog_id, 'bb',
+                                                                    nearest=True))
+        self.assertEqual(vertex_d, self.transaction.find_in_catalog(catalog_id, 'e', nearest=True))
+        self.transaction.remove_catalog_entry(catalog_id, 'c')
+        self.transaction.remove_catalog_entry(catalog_id, 'd')
+        self.assertEqual(vertex_b, self.transaction.find_in_catalog(catalog_id, 'bb',
+                                                                    nearest=True))
+        self.transaction.commit()
+        self.assertEqual(vertex_b, self.controller.find_in_catalog(catalog_id, 'bb', nearest=True))
+
     def test_count_vertex_outbound(self):
         super().test_count_vertex_outbound()
 
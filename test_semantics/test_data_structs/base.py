@@ -159,6 +159,33 @@ class DataInterfaceTestCase(TestCase, ABC):
         self.assertEqual(data.index, role_id)
         self.assertEqual(data.name, 'role')
 
+    @abstractmethod
+    def test_add_batch(self):
+        registry_stack = self.data_interface.registry_stack_map[RoleID]
+        with self.data_interface.add_batch(RoleID) as add:
+            role_ids = [add('role %s' % number).index for number in range(3)]
+            for role_id in role_ids:
+                self.assertNotIn(role_id, registry_stack)
+        for number, role_id in enumerate(role_ids):
+            data = registry_stack[role_id]
+            self.assertIsInstance(data, RoleData)
+            self.assertEqual(data.name, 'role %s' % number)
+        with self.assertRaises(KeyError):
+            with self.data_interface.add_batch(RoleID) as add:
+                role_id = add('another role').index
+                raise KeyError(role_id)
+        self.assertNotIn(role_id, registry_stack)
+
+    @abstractmethod
+    def test_create(self):
+        registry_stack = self.data_interface.registry_stack_map[RoleID]
+        data = self.data_interface.create(RoleID, 'role')
+        self.assertIsInstance(data, RoleData)
+        self.assertIn(data.index, registry_stack)
+        self.assertIsNot(data, registry_stack[data.index])
+        data.data['key'] = 'value'
+        self.assertIsNone(registry_stack[data.index].data.get('key'))
+
     @abstractmethod
     def test_read(self):
         registry_stack = self.data_interface.registry_stack_map[RoleID]
@@ -170,6 +197,16 @@ class DataInterfaceTestCase(TestCase, ABC):
             data.data['key'] = 'value'
         self.assertIsNone(registry_stack[self.preexisting_role_id].data.get('key'))
 
+    @abstractmethod
+    def test_read_attribute(self):
+        self.assertEqual(self.data_interface.read_attribute(self.preexisting_role_id, 'name'),
+                         'preexisting_role')
+        with self.data_interface.registry_lock:
+            access_manager = self.data_interface.access(self.preexisting_role_id)
+            self.assertFalse(access_manager.is_read_locked)
+        with self.assertRaises(KeyError):
+            self.data_interface.read_attribute(RoleID(1000), 'name')
+
     @abstractmethod
     def test_update(self):
         registry_stack = self.data_interface.registry_stack_map[RoleID]
@@ -218,3 +255,14 @@ class DataInterfaceTestCase(TestCase, ABC):
         with self.data_interface.registry_lock:
             with self.assertRaises(KeyError):
                 self.data_interface.get_data(self.preexisting_edge_id)
+
+    @abstractmethod
+    def test_iter_all_data(self):
+        with self.data_interface.registry_lock:
+            vertex_data = list(self.data_interface.iter_all_data(VertexID))
+        self.assertEqual({self.preexisting_source_id, self.preexisting_sink_id},
+                         {data.index for data in vertex_data})
+        with self.data_interface.remove(self.preexisting_edge_id):
+            pass
+        with self.data_interface.registry_lock:
+            self.assertEqual([], list(self.data_interface.iter_all_data(EdgeID)))
@@ -1,6 +1,8 @@
 import pickle
 from unittest import TestCase
 
+from semantics.data_control.controllers import Controller
+from semantics.data_control.transactions import Transaction
 from semantics.data_types import allocators
 
 from semantics.data_structs.controller_data import ControllerData
@@ -67,6 +69,133 @@ class TestControllerData(TestCase):
         self.assertEqual(restored.held_references, {})
         self.assertFalse(restored.registry_lock.locked())
 
+    def test_load_old_format(self):
+        with self.data.add(RoleID, "role") as role_data:
+            role_id = role_data.index
+            self.data.allocate_name('role', role_id)
+        # Saves from before pending deletion versions and catalog key deletions were tracked,
+        # and while transactions still had a name allocator stack map, still load and work.
+        state = self.data.__getstate__()
+        del state['pending_deletion_version']
+        del state['pending_catalog_deletion_map']
+        state['name_allocator_stack_map'] = state['name_allocator_map']
+        restored = ControllerData.__new__(ControllerData)
+        restored.__setstate__(state)
+        self.assertNotIn('name_allocator_stack_map', restored.__dict__)
+        with restored.read(role_id) as role_data:
+            self.assertEqual(role_data.name, 'role')
+        with restored.find(RoleID, 'role') as role_data:
+            self.assertEqual(role_data.index, role_id)
+        controller = Controller(data=restored)
+        catalog_id = controller.add_catalog('catalog', str)
+        vertex_id = controller.add_vertex(role_id)
+        controller.add_catalog_entry(catalog_id, 'key', vertex_id)
+        self.assertEqual(controller.find_in_catalog(catalog_id, 'key'), vertex_id)
+
+    def test_snapshot(self):
+        with self.data.add(RoleID, "role") as role_data:
+            role_id = role_data.index
+            self.data.name_allocator_map[RoleID].allocate('role', role_id)
+        snapshot = self.data.snapshot()
+        self.assertTrue(snapshot.is_snapshot)
+        self.assertFalse(self.data.is_snapshot)
+        with self.data.update(role_id) as role_data:
+            role_data.data['key'] = 'value'
+        with snapshot.read(role_id) as role_data:
+            self.assertEqual(role_data.name, 'role')
+            self.assertIsNone(role_data.data.get('key'))
+            # Reading from a snapshot doesn't lock the element.
+            with snapshot.registry_lock:
+                self.assertFalse(snapshot.access(role_id).is_read_locked)
+        with snapshot.find(RoleID, 'role') as role_data:
+            self.assertEqual(role_data.index, role_id)
+        # Nor does it need the registry lock.
+        with snapshot.registry_lock:
+            with snapshot.read(role_id) as role_data:
+                self.assertEqual(role_data.name, 'role')
+            with snapshot.find(RoleID, 'role') as role_data:
+                self.assertEqual(role_data.index, role_id)
+        with self.assertRaises(ValueError):
+            with snapshot.update(role_id):
+                pass
+
+    def test_snapshot_read_only(self):
+        controller = Controller(data=self.data)
+        role_id = controller.add_role('role')
+        vertex_id = controller.add_vertex(role_id)
+        catalog_id = controller.add_catalog('catalog', str)
+        controller.add_catalog_entry(catalog_id, 'key', vertex_id)
+        snapshot = self.data.snapshot()
+        with snapshot.registry_lock:
+            with self.assertRaises(ValueError):
+                snapshot.allocate_name('another role', RoleID(100))
+            with self.assertRaises(ValueError):
+                snapshot.deallocate_name('role', role_id)
+            with self.assertRaises(ValueError):
+                snapshot.allocate_catalog_key(catalog_id, 'another key', vertex_id)
+            with self.assertRaises(ValueError):
+                snapshot.deallocate_catalog_key(catalog_id, 'key')
+            with self.assertRaises(ValueError):
+                snapshot.add_catalog(CatalogID(100), allocators.MapAllocator(str, VertexID))
+            with self.assertRaises(ValueError):
+                snapshot.remove_catalog(catalog_id)
+        snapshot_controller = Controller(data=snapshot)
+        with self.assertRaises(ValueError):
+            snapshot_controller.add_catalog_entry(catalog_id, 'another key', vertex_id)
+        with self.assertRaises(ValueError):
+            Transaction(snapshot_controller)
+        self.assertIsNone(snapshot.look_up_catalog_key(catalog_id, 'another key'))
+        self.assertEqual(snapshot.look_up_name(RoleID, 'role'), role_id)
+
+    def test_snapshot_is_independent(self):
+        controller = Controller(data=self.data)
+        role_id = controller.add_role('role')
+        vertex_id = controller.add_vertex(role_id)
+        catalog_id = controller.add_catalog('catalog', str, ordered=True)
+        controller.add_catalog_entry(catalog_id, 'key', vertex_id)
+        snapshot = self.data.snapshot()
+        self.assertEqual(set(snapshot.__dict__), set(self.data.__dict__) | {'is_snapshot'})
+        self.assertIs(snapshot.registry_stack_map, snapshot.registry_map)
+        self.assertIs(snapshot.catalog_allocator_stack_map, snapshot.catalog_allocator_map)
+        # Changes made after the snapshot is taken are not visible through it.
+        controller.add_role('another role')
+        another_vertex_id = controller.add_vertex(role_id)
+        controller.add_catalog_entry(catalog_id, 'another key', another_vertex_id)
+        controller.remove_catalog_entry(catalog_id, 'key')
+        self.assertIsNone(snapshot.look_up_name(RoleID, 'another role'))
+        self.assertEqual(1, len(snapshot.registry_map[RoleID]))
+        self.assertEqual(1, len(snapshot.registry_map[VertexID]))
+        self.assertEqual(1, snapshot.usage_counts[role_id])
+        self.assertEqual(['key'], list(snapshot.catalog_allocator_map[catalog_id]))
+        self.assertEqual(vertex_id, snapshot.look_up_nearest_catalog_key(catalog_id, 'a'))
+        self.assertEqual(1, snapshot.id_allocator_map[VertexID].total_allocated)
+
+    def test_saved_snapshot_is_writable(self):
+        snapshot = self.data.snapshot()
+        restored = pickle.loads(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL))
+        self.assertTrue(snapshot.is_snapshot)
+        self.assertFalse(restored.is_snapshot)
+        with restored.add(RoleID, 'role') as role_data:
+            self.assertEqual(role_data.name, 'role')
+
+    def test_usage_counts_match_full_scan(self):
+        controller = Controller(data=self.data)
+        role_ids = [controller.add_role('role %s' % number) for number in range(3)]
+        label_id = controller.add_label('label')
+        vertex_ids = [controller.add_vertex(role_ids[number % 2]) for number in range(6)]
+        edge_ids = [controller.add_edge(label_id, source_id, sink_id)
+                    for source_id, sink_id in zip(vertex_ids, vertex_ids[1:])]
+        controller.remove_edge(edge_ids[0])
+        controller.remove_vertex(vertex_ids[-1], adjacent_edges=True)
+        controller.remove_role(role_ids[2])
+        with self.data.registry_lock:
+            maintained = dict(self.data.usage_counts)
+            self.data.count_all_usages()
+            self.assertEqual(maintained, self.data.usage_counts)
+            self.assertFalse(self.data.is_in_use(vertex_ids[0]))
+            self.assertTrue(self.data.is_in_use(role_ids[0]))
+            self.assertTrue(self.data.is_in_use(label_id))
+
     def test_allocate_name(self):
         self.data.allocate_name('name', RoleID(100))
         self.assertEqual(self.data.name_allocator_map[RoleID]['name'], RoleID(100))
@@ -89,9 +218,18 @@ class TestDataInterfaceForControllerData(base.DataInterfaceTestCase):
     def test_add(self):
         super().test_add()
 
+    def test_add_batch(self):
+        super().test_add_batch()
+
+    def test_create(self):
+        super().test_create()
+
     def test_read(self):
         super().test_read()
 
+    def test_read_attribute(self):
+        super().test_read_attribute()
+
     def test_update(self):
         super().test_update()
 
@@ -103,3 +241,6 @@ class TestDataInterfaceForControllerData(base.DataInterfaceTestCase):
 
     def test_get_data(self):
         super().test_get_data()
+
+    def test_iter_all_data(self):
+        super().test_iter_all_data()
@@ -1,7 +1,9 @@
 import copy
+import pickle
 from unittest import TestCase
 
-from semantics.data_structs.element_data import RoleData, VertexData, LabelData, EdgeData
+from semantics.data_structs.element_data import ElementData, RoleData, VertexData, LabelData, \
+    EdgeData
 from semantics.data_types.indices import RoleID, VertexID, EdgeID, LabelID
 
 
@@ -68,3 +70,53 @@ class TestEdgeData(TestCase):
         self.assertEqual(copied_data.label, edge_data.label, "Label IDs should be the same")
         self.assertEqual(copied_data.source, edge_data.source, "Source IDs should be the same")
         self.assertEqual(copied_data.sink, edge_data.sink, "Sink IDs should be the same")
+
+
+class TestCopyOnWrite(TestCase):
+
+    def test_generated_copiers(self):
+        for element_type in (RoleData, VertexData, LabelData, EdgeData):
+            self.assertIs(element_type.__copy__, element_type.copy)
+            self.assertIsNot(element_type.copy, ElementData.copy)
+        edge_data = EdgeData(EdgeID(1), LabelID(2), VertexID(3), VertexID(4))
+        copied_data = copy.copy(edge_data)
+        self.assertIs(type(copied_data), EdgeData)
+        self.assertEqual((copied_data.label, copied_data.source, copied_data.sink),
+                         (edge_data.label, edge_data.source, edge_data.sink))
+
+    def test_copy_shares_containers_until_accessed(self):
+        vertex_data = VertexData(VertexID(1), RoleID(2))
+        vertex_data.inbound.add(EdgeID(1))
+        copied_data = copy.copy(vertex_data)
+        self.assertFalse(copied_data.has_modifications())
+        self.assertIs(copied_data._inbound, vertex_data._inbound)
+        copied_data.inbound.add(EdgeID(3))
+        self.assertTrue(copied_data.has_modifications())
+        self.assertEqual(vertex_data.inbound, {EdgeID(1)})
+        self.assertEqual(copied_data.inbound, {EdgeID(1), EdgeID(3)})
+
+    def test_counts_do_not_unshare(self):
+        vertex_data = VertexData(VertexID(1), RoleID(2))
+        vertex_data.inbound.add(EdgeID(1))
+        copied_data = copy.copy(vertex_data)
+        self.assertEqual(copied_data.inbound_count, 1)
+        self.assertEqual(copied_data.outbound_count, 0)
+        self.assertFalse(copied_data.has_modifications())
+
+    def test_original_is_protected_from_copy(self):
+        role_data = RoleData(RoleID(0), 'role_name')
+        copied_data = copy.copy(role_data)
+        role_data.data['a'] = 'b'
+        self.assertNotIn('a', copied_data.data)
+
+    def test_pickle_copy(self):
+        vertex_data = VertexData(VertexID(1), RoleID(2))
+        vertex_data.data['p'] = 'q'
+        vertex_data.outbound.add(EdgeID(2))
+        restored_data = pickle.loads(pickle.dumps(copy.copy(vertex_data)))
+        self.assertFalse(hasattr(restored_data, '__dict__'))
+        self.assertTrue(restored_data.has_modifications())
+        self.assertEqual(restored_data.index, vertex_data.index)
+        self.assertEqual(restored_data.preferred_role, vertex_data.preferred_role)
+        self.assertEqual(restored_data.data, vertex_data.data)
+        self.assertEqual(restored_data.outbound, vertex_data.outbound)
@@ -102,7 +102,7 @@ class TestFinding(TestCase):
     def do_test(self, data: DataInterface):
         with data.add(RoleID, 'role') as role_data:
             role_id = role_data.index
-            data.name_allocator_map[RoleID].allocate('role', role_id)
+            data.allocate_name('role', role_id)
 
         with Finding(data, RoleID, 'bad name') as role_data_copy:
             self.assertIsNone(role_data_copy)
@@ -155,7 +155,7 @@ class TestUpdating(TestCase):
     def do_test(self, data: DataInterface):
         with data.add(RoleID, 'role') as role_data:
             role_id = role_data.index
-            data.name_allocator_map[RoleID].allocate('role', role_id)
+            data.allocate_name('role', role_id)
 
         with self.assertRaises(FakeException):
             with Updating(data, role_id) as role_data_copy:
@@ -192,6 +192,11 @@ class TestUpdating(TestCase):
         self.assertEqual(role_data.name, 'role')
         self.assertEqual(role_data.data.get('key'), 'value')
 
+        # An update that doesn't touch the data leaves the registry entry in place.
+        with Updating(data, role_id) as role_data_copy:
+            self.assertEqual(role_data_copy.name, 'role')
+        self.assertIs(data.registry_map[RoleID][role_id], role_data)
+
     def test_controller_data(self):
         data = ControllerData()
         self.do_test(data)
@@ -201,12 +206,34 @@ class TestUpdating(TestCase):
         self.do_test(data)
 
 
+class TestUpdatingTransactionCopy(TestCase):
+
+    def test_rollback_preserves_earlier_transaction_update(self):
+        # The temporary copy must be made even when the transaction already has its own copy of
+        # the element, or else a rolled back update would leak into the transaction's copy.
+        controller_data = ControllerData()
+        with controller_data.add(RoleID, 'role') as role_data:
+            role_id = role_data.index
+        data = TransactionData(controller_data)
+        with Updating(data, role_id) as role_data:
+            role_data.data['key'] = 'first'
+        transaction_entry = data.registry_map[RoleID][role_id]
+        with self.assertRaises(FakeException):
+            with Updating(data, role_id) as role_data:
+                self.assertIsNot(role_data, transaction_entry)
+                role_data.data['key'] = 'second'
+                raise FakeException()
+        self.assertIs(data.registry_map[RoleID][role_id], transaction_entry)
+        self.assertEqual(transaction_entry.data['key'], 'first')
+        self.assertIsNone(controller_data.registry_map[RoleID][role_id].data.get('key'))
+
+
 class TestRemoving(TestCase):
 
     def do_test(self, data: DataInterface):
         with data.add(RoleID, 'role') as role_data:
             role_id = role_data.index
-            data.name_allocator_map[RoleID].allocate('role', role_id)
+            data.allocate_name('role', role_id)
 
         with self.assertRaises(FakeException):
             with Removing(data, role_id) as role_data_copy:
@@ -244,3 +271,33 @@ class TestRemoving(TestCase):
     def test_transaction_data(self):
         data = TransactionData(ControllerData())
         self.do_test(data)
+
+
+class TestContextReuse(TestCase):
+
+    def test_contexts_are_slotted(self):
+        data = ControllerData()
+        with data.add(RoleID, 'role') as role_data:
+            role_id = role_data.index
+        for context in (data.add(RoleID, 'other_role'), data.read(role_id),
+                        data.find(RoleID, 'role'), data.update(role_id), data.remove(role_id)):
+            self.assertFalse(hasattr(context, '__dict__'), type(context).__name__)
+
+    def test_reentered_context_keeps_its_element(self):
+        data = ControllerData()
+        with data.add(RoleID, 'role1') as role_data:
+            role_id1 = role_data.index
+        with data.add(RoleID, 'role2') as role_data:
+            role_id2 = role_data.index
+        read_context = data.read(role_id1)
+        update_context = data.update(role_id1)
+        with read_context, update_context:
+            pass
+        with data.read(role_id2), data.update(role_id2):
+            pass
+        # Contexts are never handed out twice, so a context kept by the caller still refers to
+        # the element it was created for.
+        with read_context as role_data:
+            self.assertEqual(role_data.index, role_id1)
+        with update_context as role_data:
+            self.assertEqual(role_data.index, role_id1)
@@ -17,6 +17,10 @@ class TestTransactionData(TestCase):
         self.transaction = Transaction(controller)
         self.data = self.transaction._data
 
+    def test_slotted(self):
+        self.assertFalse(hasattr(self.data, '__dict__'))
+        self.assertFalse(self.data.is_snapshot)
+
     def test_access_to_deleted_item(self):
         role_id = self.controller.add_role('role')
         self.transaction.remove_role(role_id)
@@ -24,6 +28,100 @@ class TestTransactionData(TestCase):
             with self.assertRaises(KeyError):
                 self.data.access(role_id)
 
+    def test_pending_deletion_version(self):
+        role_id = self.controller.add_role('role')
+        self.assertEqual(self.data.pending_deletion_version, 0)
+        self.transaction.remove_role(role_id)
+        # One bump for the role's name, and one for the role itself.
+        self.assertEqual(self.data.pending_deletion_version, 2)
+        self.transaction.commit()
+        self.assertEqual(self.data.pending_deletion_version, 0)
+
+    def test_pending_deletion_sets_created_as_needed(self):
+        role_id = self.controller.add_role('role')
+        self.assertEqual(self.data.pending_deletion_map, {})
+        self.assertEqual(self.data.pending_name_deletion_map, {})
+        self.transaction.remove_role(role_id)
+        self.assertEqual(self.data.pending_deletion_map, {RoleID: {role_id}})
+        self.assertEqual(self.data.pending_name_deletion_map, {RoleID: {'role'}})
+        with self.data.registry_lock:
+            self.assertEqual(list(self.data.iter_all(RoleID)), [])
+        self.transaction.rollback()
+        self.assertEqual(self.data.pending_deletion_map, {})
+        self.assertEqual(self.data.pending_name_deletion_map, {})
+        with self.data.registry_lock:
+            self.assertEqual(list(self.data.iter_all(RoleID)), [role_id])
+
+    def test_allocators_created_as_needed(self):
+        catalog_id = self.controller.add_catalog('catalog', str)
+        transaction = Transaction(self.controller)
+        data = transaction._data
+        self.assertEqual(data.name_allocator_map, {})
+        self.assertEqual(data.catalog_allocator_map, {})
+        self.assertIs(data.catalog_allocator_stack_map[catalog_id],
+                      self.controller._data.catalog_allocator_map[catalog_id])
+        role_id = transaction.add_role('role')
+        vertex_id = transaction.add_vertex(role_id)
+        transaction.add_catalog_entry(catalog_id, 'key', vertex_id)
+        self.assertEqual(set(data.name_allocator_map), {RoleID})
+        self.assertEqual(set(data.catalog_allocator_map), {catalog_id})
+        self.assertEqual(transaction.find_in_catalog(catalog_id, 'key'), vertex_id)
+        self.assertEqual(transaction.get_catalog_size(catalog_id), 1)
+        transaction.commit()
+        self.assertEqual(self.controller.find_in_catalog(catalog_id, 'key'), vertex_id)
+
+    def test_remove_untouched_catalog(self):
+        catalog_id = self.controller.add_catalog('catalog', str)
+        transaction = Transaction(self.controller)
+        transaction.remove_catalog(catalog_id)
+        self.assertIsNone(transaction.find_catalog('catalog'))
+        transaction.commit()
+        self.assertIsNone(self.controller.find_catalog('catalog'))
+
+    def test_registry_stack_map(self):
+        controller_role_id = self.controller.add_role('controller role')
+        transaction_role_id = self.transaction.add_role('transaction role')
+        self.assertNotIn(RoleID, self.data.registry_stack_map)
+        registry_stack = self.data.registry_stack_map[RoleID]
+        self.assertIs(registry_stack, self.data.registry_stack_map[RoleID])
+        self.assertIn(controller_role_id, registry_stack)
+        self.assertIn(transaction_role_id, registry_stack)
+        with self.assertRaises(KeyError):
+            _ = self.data.registry_stack_map[int]
+
+    def test_remove_catalog_entry(self):
+        role_id = self.controller.add_role('role')
+        catalog_id = self.controller.add_catalog('catalog', str)
+        vertex_id = self.controller.add_vertex(role_id)
+        self.controller.add_catalog_entry(catalog_id, 'key', vertex_id)
+        transaction = Transaction(self.controller)
+        transaction.remove_catalog_entry(catalog_id, 'key')
+        self.assertIsNone(transaction.find_in_catalog(catalog_id, 'key'))
+        self.assertEqual(self.controller.find_in_catalog(catalog_id, 'key'), vertex_id)
+        transaction.rollback()
+        self.assertEqual(transaction.find_in_catalog(catalog_id, 'key'), vertex_id)
+        transaction.remove_catalog_entry(catalog_id, 'key')
+        transaction.commit()
+        self.assertIsNone(self.controller.find_in_catalog(catalog_id, 'key'))
+        self.assertEqual(transaction._data.pending_catalog_deletion_map, {})
+
+    def test_usage_counts(self):
+        role_id = self.controller.add_role('role')
+        vertex_id = self.transaction.add_vertex(role_id)
+        with self.data.registry_lock:
+            self.assertTrue(self.data.is_in_use(role_id))
+            self.assertFalse(self.data.controller_data.is_in_use(role_id))
+        self.transaction.commit()
+        with self.data.registry_lock:
+            self.assertEqual(self.data.usage_counts, {})
+            self.assertTrue(self.data.controller_data.is_in_use(role_id))
+        self.transaction.remove_vertex(vertex_id)
+        with self.data.registry_lock:
+            self.assertFalse(self.data.is_in_use(role_id))
+        self.transaction.rollback()
+        with self.data.registry_lock:
+            self.assertTrue(self.data.is_in_use(role_id))
+
     def test_allocate_name(self):
         self.data.allocate_name('name', RoleID(100))
         self.assertEqual(self.data.name_allocator_map[RoleID]['name'], RoleID(100))
@@ -36,6 +134,40 @@ class TestTransactionData(TestCase):
         self.assertFalse(self.data.name_allocator_map[RoleID].is_reserved('role'))
         self.assertIn('role', self.data.controller_data.name_allocator_map[RoleID].keys())
 
+    def test_look_up_name(self):
+        role_id = self.controller.add_role('role')
+        self.data.allocate_name('name', RoleID(100))
+        self.assertEqual(self.data.look_up_name(RoleID, 'role'), role_id)
+        self.assertEqual(self.data.look_up_name(RoleID, 'name'), RoleID(100))
+        self.assertIsNone(self.data.look_up_name(RoleID, 'missing'))
+
+    def test_look_up_data(self):
+        controller_role_id = self.controller.add_role('controller role')
+        transaction_role_id = self.transaction.add_role('transaction role')
+        with self.data.registry_lock:
+            self.assertIs(self.data.look_up_data(controller_role_id),
+                          self.data.controller_data.registry_map[RoleID][controller_role_id])
+            self.assertIs(self.data.look_up_data(transaction_role_id),
+                          self.data.registry_map[RoleID][transaction_role_id])
+            with self.assertRaises(KeyError):
+                self.data.look_up_data(RoleID(1000))
+
+    def test_look_up_catalog_key(self):
+        role_id = self.controller.add_role('role')
+        catalog_id = self.controller.add_catalog('catalog', str)
+        controller_vertex_id = self.controller.add_vertex(role_id)
+        self.controller.add_catalog_entry(catalog_id, 'controller', controller_vertex_id)
+        # The transaction only sees catalogs that existed when it started.
+        transaction = Transaction(self.controller)
+        data = transaction._data
+        transaction_vertex_id = transaction.add_vertex(role_id)
+        transaction.add_catalog_entry(catalog_id, 'transaction', transaction_vertex_id)
+        self.assertEqual(data.look_up_catalog_key(catalog_id, 'controller'), controller_vertex_id)
+        self.assertEqual(data.look_up_catalog_key(catalog_id, 'transaction'),
+                         transaction_vertex_id)
+        self.assertIsNone(data.look_up_catalog_key(catalog_id, 'missing'))
+        transaction.rollback()
+
     def test_deallocate_name(self):
         self.data.allocate_name('name', RoleID(100))
         with self.assertRaises(AssertionError):
@@ -54,9 +186,18 @@ class TestDataInterfaceForTransactionData(base.DataInterfaceTestCase):
     def test_add(self):
         super().test_add()
 
+    def test_add_batch(self):
+        super().test_add_batch()
+
+    def test_create(self):
+        super().test_create()
+
     def test_read(self):
         super().test_read()
 
+    def test_read_attribute(self):
+        super().test_read_attribute()
+
     def test_update(self):
         super().test_update()
 
@@ -68,3 +209,6 @@ class TestDataInterfaceForTransactionData(base.DataInterfaceTestCase):
 
     def test_get_data(self):
         super().test_get_data()
+
+    def test_iter_all_data(self):
+        super().test_iter_all_data()
@@ -126,6 +126,14 @@ class MapAllocatorTestCase(TestCase, ABC):
         allocator.reserve('b', 'B')  # Canceling all reservations allows reservation by another
         with self.assertRaises(KeyError):
             allocator.reserve('c', 'A')  # Other owners are unaffected
+        allocator.allocate('b', VertexID(0), 'B')  # Allocating uses up the reservation
+        allocator.cancel_reservation('c', 'B')
+        allocator.cancel_all_reservations('B')
+        self.assertFalse(allocator.is_reserved('a'))
+        allocator.reserve('a', 'A')
+        allocator.reserve('c', 'A')
+        allocator.cancel_all_reservations('B')  # Nothing left to cancel
+        self.assertTrue(allocator.is_reserved('a'))
 
     @abstractmethod
     def test_allocate(self):
@@ -235,3 +243,21 @@ class MapAllocatorTestCase(TestCase, ABC):
         allocator.allocate('a', VertexID(1))  # After clear, all names are no longer allocated
         allocator.allocate('b', VertexID(0))  # After clear, all indices are no longer allocated
         allocator.allocate('c', VertexID(2), 'A')  # After clear, all reservations are canceled
+
+    @abstractmethod
+    def test_copy(self):
+        allocator = self.map_allocator_type(str, VertexID)
+        allocator.allocate('b', VertexID(1))
+        allocator.allocate('a', VertexID(0))
+        allocator.reserve('c', 'C')
+        duplicate = allocator.copy()
+        self.assertIs(type(duplicate), self.map_allocator_type)
+        self.assertEqual(sorted(duplicate), ['a', 'b'])
+        self.assertEqual(duplicate.get_key(VertexID(1)), 'b')
+        self.assertFalse(duplicate.is_reserved('c'))  # Reservations are not copied
+        # Changes to either allocator are not seen by the other.
+        allocator.deallocate('a')
+        duplicate.allocate('d', VertexID(3))
+        self.assertEqual(duplicate.get_index('a'), VertexID(0))
+        self.assertIsNone(allocator.get_index('d'))
+        self.assertIsNone(allocator.get_key(VertexID(3)))
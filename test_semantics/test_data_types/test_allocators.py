@@ -1,3 +1,5 @@
+import pickle
+import threading
 from unittest import TestCase
 
 from semantics.data_types.allocators import IndexAllocator, MapAllocator, OrderedMapAllocator
@@ -30,6 +32,43 @@ class TestIndexAllocator(TestCase):
         allocator.new_id()
         self.assertEqual(allocator.total_allocated, 2)
 
+    def test_new_id_from_many_threads(self):
+        allocator = IndexAllocator(VertexID)
+        allocated = []
+
+        def allocate():
+            allocated.extend(allocator.new_id() for _ in range(1000))
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(allocated)), 4000)
+        self.assertEqual(allocator.total_allocated, 4000)
+
+    def test_pickle(self):
+        allocator = IndexAllocator(VertexID)
+        allocator.new_id()
+        restored = pickle.loads(pickle.dumps(allocator))
+        self.assertEqual(restored.total_allocated, 1)
+        self.assertEqual(restored.new_id(), VertexID(1))
+        # The saved state is the next index and the index type, as in existing save files.
+        self.assertEqual(allocator.__getstate__(), (1, VertexID))
+
+    def test_pickle_round_trip(self):
+        allocator = IndexAllocator(VertexID)
+        allocated = {allocator.new_id() for _ in range(100)}
+        restored = pickle.loads(pickle.dumps(allocator))
+        self.assertEqual(restored.total_allocated, 100)
+        new_ids = {restored.new_id() for _ in range(100)}
+        self.assertFalse(allocated & new_ids)
+        # The restored allocator reports its total just like the original.
+        restored_again = pickle.loads(pickle.dumps(restored))
+        self.assertEqual(restored_again.total_allocated, 200)
+        self.assertEqual(restored_again.new_id(), VertexID(200))
+        self.assertEqual(allocator.total_allocated, 100)
+
 
 class TestMapAllocator(base.MapAllocatorTestCase):
     
@@ -86,6 +125,9 @@ class TestMapAllocator(base.MapAllocatorTestCase):
     def test_clear(self):
         super().test_clear()
 
+    def test_copy(self):
+        super().test_copy()
+
 
 class TestOrderedMapAllocator(base.MapAllocatorTestCase):
 
@@ -143,3 +185,36 @@ class TestOrderedMapAllocator(base.MapAllocatorTestCase):
 
     def test_clear(self):
         super().test_clear()
+
+    def test_copy(self):
+        super().test_copy()
+
+    def test_update_keeps_keys_sorted(self):
+        allocator1 = OrderedMapAllocator(str, VertexID)
+        allocator1.allocate('b', VertexID(1))
+        allocator1.allocate('d', VertexID(3))
+        allocator2 = OrderedMapAllocator(str, VertexID)
+        allocator2.allocate('e', VertexID(4))
+        allocator2.allocate('a', VertexID(0))
+        allocator2.allocate('c', VertexID(2))
+        allocator1.update(allocator2)
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], list(allocator1))
+        self.assertEqual(VertexID(2), allocator1.get('bb', nearest=True))
+
+    def test_copy_keeps_keys_sorted(self):
+        allocator = OrderedMapAllocator(str, VertexID)
+        allocator.allocate('c', VertexID(2))
+        allocator.allocate('a', VertexID(0))
+        duplicate = allocator.copy()
+        duplicate.allocate('b', VertexID(1))
+        self.assertEqual(['a', 'b', 'c'], list(duplicate))
+        self.assertEqual(['a', 'c'], list(allocator))
+        self.assertEqual(VertexID(1), duplicate.get('aa', nearest=True))
+
+    def test_allocate_same_pair_twice(self):
+        allocator = OrderedMapAllocator(str, VertexID)
+        allocator.allocate('a', VertexID(0))
+        allocator.allocate('a', VertexID(0))
+        self.assertEqual(['a'], list(allocator))
+        allocator.deallocate('a')
+        self.assertEqual([], list(allocator))
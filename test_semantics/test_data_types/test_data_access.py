@@ -1,4 +1,5 @@
 import contextlib
+import pickle
 import threading
 from unittest import TestCase
 
@@ -93,6 +94,26 @@ class TestThreadAccessManager(TestCase):
                 # But a write lock request fails if there are multiple readers
                 threaded_call(manager.acquire_write)
 
+    def test_shared_read_lock(self):
+        manager = ControllerThreadAccessManager(PersistentDataID(0))
+        manager.acquire_read()
+        with threaded_context(manager.read_lock):
+            # Our read lock is released while the other thread still holds its own.
+            manager.release_read()
+            self.assertTrue(manager.is_read_locked)
+            with self.assertRaises(ResourceUnavailableError):
+                manager.acquire_write()
+            with manager.read_lock:
+                pass
+        self.assertFalse(manager.is_read_locked)
+        with manager.read_lock:
+            with threaded_context(manager.read_lock):
+                pass
+            # Once the other thread is done reading, we can write again.
+            with manager.write_lock:
+                pass
+        self.assertFalse(manager.is_read_locked)
+
     def test_write_lock(self):
         manager = ControllerThreadAccessManager(PersistentDataID(0))
         with manager.write_lock:  # We don't have to hold a read lock to acquire a write lock
@@ -107,3 +128,20 @@ class TestThreadAccessManager(TestCase):
             with self.assertRaises(ResourceUnavailableError):
                 threaded_call(manager.acquire_write)  # Other threads can't write if we are writing
         threaded_call(manager.acquire_write)  # Other threads can do stuff once we are done
+
+    def test_pickle(self):
+        manager = ControllerThreadAccessManager(PersistentDataID(0))
+        self.assertFalse(hasattr(manager, '__dict__'))
+        with manager.read_lock:
+            restored = pickle.loads(pickle.dumps(manager, pickle.HIGHEST_PROTOCOL))
+        self.assertFalse(manager.is_read_locked)
+        self.assertEqual(restored.index, manager.index)
+        # Lock state belongs to the running process and isn't saved.
+        self.assertFalse(restored.is_read_locked)
+        self.assertFalse(restored.is_write_locked)
+        # Saves from before the lock state was dropped still load.
+        restored = ControllerThreadAccessManager.__new__(ControllerThreadAccessManager)
+        restored.__setstate__({'_index': PersistentDataID(1), '_read_locked_by': {},
+                               '_write_locked_by': None})
+        self.assertEqual(restored.index, PersistentDataID(1))
+        self.assertFalse(restored.is_read_locked)
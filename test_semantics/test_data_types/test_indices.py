@@ -1,6 +1,7 @@
+import pickle
 from unittest import TestCase
 
-from semantics.data_types.indices import UniqueID
+from semantics.data_types.indices import UniqueID, RoleID, VertexID, LabelID, EdgeID, CatalogID
 
 
 class TestUniqueID(TestCase):
@@ -18,3 +19,13 @@ class TestUniqueID(TestCase):
                             "Two IDs with different values should be unequal")
         self.assertNotEqual(Subclass1(0), Subclass2(0),
                             "Two IDs with different types should be unequal")
+
+    def test_compact_and_hashable(self):
+        for index_type in (RoleID, VertexID, LabelID, EdgeID, CatalogID):
+            index = index_type(10)
+            self.assertFalse(hasattr(index, '__dict__'),
+                             "Indices should not carry an instance dict")
+            self.assertEqual(hash(index), hash(10),
+                             "Indices should hash like the integers they wrap")
+            self.assertEqual(pickle.loads(pickle.dumps(index)), index,
+                             "Indices should survive pickling")
@@ -2,6 +2,9 @@ import pickle
 from unittest import TestCase
 from unittest.mock import patch
 
+import iso639
+
+from semantics.data_types import language_ids
 from semantics.data_types.language_ids import LanguageID
 
 
@@ -82,3 +85,12 @@ class TestLanguageID(TestCase):
         language_id = LanguageID('eng')
         pickled = pickle.dumps(language_id, protocol=pickle.HIGHEST_PROTOCOL)
         self.assertEqual(language_id, pickle.loads(pickled))
+
+    def test_lookup_cached(self):
+        language_ids._to_iso639_2t.cache_clear()
+        with patch('iso639.to_iso639_2', wraps=iso639.to_iso639_2) as to_iso639_2:
+            lid = LanguageID(self.iso639_2_t_code)
+            restored = pickle.loads(pickle.dumps(lid))
+            self.assertEqual(lid, restored)
+            self.assertEqual(self.iso639_2_t_code, str(restored))
+            to_iso639_2.assert_called_once()
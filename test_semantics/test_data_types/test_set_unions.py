@@ -32,3 +32,10 @@ class TestSetUnion(TestCase):
         assert c[1] == 1
         assert c[2] == 1
         assert c[3] == 1
+
+    def test_non_set_subsets(self):
+        a = {1: 'a', 2: 'b'}
+        b = {2: 'b', 3: 'c'}
+        u = SetUnion(a.keys(), b.keys())
+        assert len(u) == 3
+        assert sorted(u) == [1, 2, 3]